@@ -2,7 +2,7 @@ import os
 from typing import Annotated
 
 from fastapi import Depends, FastAPI, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import Session
 
 from syntropism.api.dependencies import get_db
@@ -22,10 +22,12 @@ app = FastAPI(title="BP Agents API")
 async def startup_event():
     # Start NATS handlers
     nats_url = os.getenv("NATS_URL", "nats://localhost:4222")
-    app.state.economy_nc = await EconomicEngine().run_nats(nats_url)
-    app.state.market_nc = await MarketManager().run_nats(nats_url)
-    app.state.social_nc = await SocialManager().run_nats(nats_url)
-    app.state.evolution_nc = await EvolutionManager().run_nats(nats_url)
+    # Namespaces every subscribed subject, e.g. per test worker sharing one NATS server; empty in production
+    subject_prefix = os.getenv("NATS_SUBJECT_PREFIX", "")
+    app.state.economy_nc = await EconomicEngine().run_nats(nats_url, subject_prefix=subject_prefix)
+    app.state.market_nc = await MarketManager().run_nats(nats_url, subject_prefix=subject_prefix)
+    app.state.social_nc = await SocialManager().run_nats(nats_url, subject_prefix=subject_prefix)
+    app.state.evolution_nc = await EvolutionManager().run_nats(nats_url, subject_prefix=subject_prefix)
 
 
 @app.on_event("shutdown")
@@ -41,6 +43,8 @@ app.include_router(llm_router, prefix="/api/v1", tags=["llm"])
 
 
 class TransferRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     from_id: str
     to_id: str
     amount: float
@@ -52,12 +56,16 @@ class RewardRequest(RewardScores):
 
 
 class SpawnRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     parent_id: str
     initial_credits: float
     payload: dict[str, str] | None = None
 
 
 class MessageRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     from_id: str
     to_id: str
     content: str
@@ -102,6 +110,21 @@ def submit_prompt(request: PromptRequest, db: Annotated[Session, Depends(get_db)
         raise HTTPException(status_code=400, detail=str(e)) from e
 
 
+@app.get("/human/prompts")
+def get_awaiting_prompts(db: Annotated[Session, Depends(get_db)]):
+    prompts = AttentionManager.get_awaiting_prompts(db)
+    return [
+        {
+            "prompt_id": p.id,
+            "agent_id": p.from_agent_id,
+            "content": p.content,
+            "bid_amount": p.bid_amount,
+            "status": p.status.value,
+        }
+        for p in prompts
+    ]
+
+
 @app.post("/social/spawn")
 def spawn_agent(request: SpawnRequest, db: Annotated[Session, Depends(get_db)]):
     try:
@@ -1,7 +1,9 @@
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
+import orjson
 from pydantic import BaseModel, Field
 
 
@@ -43,18 +45,24 @@ class BenchmarkConstructor:
         self.data_dir = data_dir
 
     def load_all(self) -> list[BenchmarkScenario]:
-        scenarios = []
-        for root, _, files in os.walk(self.data_dir):
-            for file in files:
-                if file.endswith(".json"):
-                    path = os.path.join(root, file)
-                    with open(path) as f:
-                        try:
-                            data = json.load(f)
-                            scenarios.append(BenchmarkScenario(**data))
-                        except Exception as e:
-                            print(f"Error loading benchmark {path}: {e}")
-        return scenarios
+        paths = [
+            os.path.join(root, file)
+            for root, _, files in os.walk(self.data_dir)
+            for file in files
+            if file.endswith(".json")
+        ]
+        # File reads release the GIL, so the catalogue is read on a small thread pool
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            loaded = pool.map(self._load_scenario, paths)
+            return [scenario for scenario in loaded if scenario is not None]
+
+    @staticmethod
+    def _load_scenario(path: str) -> BenchmarkScenario | None:
+        try:
+            return BenchmarkScenario(**orjson.loads(Path(path).read_bytes()))
+        except Exception as e:
+            print(f"Error loading benchmark {path}: {e}")
+            return None
 
     def validate_scenario(self, scenario: BenchmarkScenario):
         """
@@ -1,14 +1,19 @@
-import json
+import asyncio
+from collections import defaultdict
 
 import nats
+import orjson
 from loguru import logger
 
 
 class BenchmarkRunner:
-    def __init__(self, nats_url: str = "nats://localhost:4222"):
+    def __init__(self, nats_url: str = "nats://localhost:4222", subject_prefix: str = ""):
         self.nats_url = nats_url
+        # Only events published under this prefix are collected
+        self.subject_prefix = subject_prefix
         self.nc = None
         self.events = []
+        self._events_changed = asyncio.Condition()
 
     async def connect(self):
         self.nc = await nats.connect(self.nats_url)
@@ -16,47 +21,52 @@ class BenchmarkRunner:
 
     async def start_collecting(self):
         async def event_handler(msg):
-            event = json.loads(msg.data)
-            self.events.append(event)
+            event = orjson.loads(msg.data)
+            async with self._events_changed:
+                self.events.append(event)
+                self._events_changed.notify_all()
             logger.debug(f"BenchmarkRunner collected event: {event}")
 
-        await self.nc.subscribe("system.*.*", cb=event_handler)
+        await self.nc.subscribe(f"{self.subject_prefix}system.*.*", cb=event_handler)
+
+    async def wait_for_events(self, n: int, timeout: float = 2.0) -> bool:
+        """Wait until at least n events have been collected. Returns False if the timeout expires first."""
+        async with self._events_changed:
+            try:
+                await asyncio.wait_for(self._events_changed.wait_for(lambda: len(self.events) >= n), timeout)
+            except TimeoutError:
+                logger.warning(f"BenchmarkRunner timed out waiting for {n} events, got {len(self.events)}")
+                return False
+        return True
 
     def validate_scenario(self, scenario: dict) -> bool:
         required_sequence = scenario.get("validation", {}).get("required_event_sequence", [])
         forbidden_events = scenario.get("validation", {}).get("forbidden_events", [])
 
-        # Check for forbidden events
+        # Check for forbidden events, looking only at events of the forbidden type when one is given
+        events_by_type = defaultdict(list)
         for event in self.events:
-            for forbidden in forbidden_events:
+            events_by_type[event.get("type")].append(event)
+        for forbidden in forbidden_events:
+            candidates = events_by_type.get(forbidden["type"], []) if "type" in forbidden else self.events
+            for event in candidates:
                 if all(event.get(k) == v for k, v in forbidden.items()):
                     logger.error(f"Forbidden event detected: {event}")
                     return False
 
-        # Check for required sequence (order matters)
-        event_idx = 0
-        for required in required_sequence:
-            found = False
-            while event_idx < len(self.events):
-                event = self.events[event_idx]
-                event_idx += 1
-                # Match required event (simple equality for now)
-                # Handle constraints if present
-                match = True
-                for k, v in required.items():
-                    if k == "constraints":
-                        continue  # TODO: Implement constraint validation
-                    if event.get(k) != v:
-                        match = False
-                        break
-
-                if match:
-                    found = True
-                    break
+        # Check for required sequence (order matters) in one forward scan over the events
+        # TODO: Implement constraint validation; constraints are ignored when matching for now
+        expected = [{k: v for k, v in required.items() if k != "constraints"} for required in required_sequence]
+        matched = 0
+        for event in self.events:
+            if matched == len(expected):
+                break
+            if all(event.get(k) == v for k, v in expected[matched].items()):
+                matched += 1
 
-            if not found:
-                logger.error(f"Required event not found in sequence: {required}")
-                return False
+        if matched < len(expected):
+            logger.error(f"Required event not found in sequence: {required_sequence[matched]}")
+            return False
 
         return True
 
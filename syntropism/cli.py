@@ -14,6 +14,7 @@ import os
 import sys
 import threading
 
+import nats
 import uvicorn
 
 # Add the project root to the path
@@ -24,7 +25,7 @@ from sqlalchemy.orm import Session
 from syntropism.core.genesis import create_genesis_agent
 from syntropism.core.orchestrator import run_system_loop
 from syntropism.domain.market import ResourceType
-from syntropism.domain.models import Agent, Bid, BidStatus, MarketState, ResourceBundle
+from syntropism.domain.models import Agent, Bid, BidStatus, MarketState, Prompt, PromptStatus, ResourceBundle
 from syntropism.infra.database import Base, SessionLocal, engine
 
 
@@ -82,6 +83,12 @@ def check_completed_bids(session: Session) -> bool:
     return completed is not None
 
 
+def check_awaiting_prompts(session: Session) -> bool:
+    """Check if any prompts have been announced for review but not yet scored."""
+    awaiting = session.query(Prompt).filter_by(status=PromptStatus.ACTIVE).first()
+    return awaiting is not None
+
+
 def bootstrap_genesis_execution(session: Session):
     """
     Bootstrap the system by manually triggering Genesis agent execution.
@@ -178,16 +185,27 @@ def main():
         print("API Server started on port 8000.")
 
         async def run_loop():
-            while True:
-                print("\n--- Starting System Loop ---")
-                # Refresh session to ensure we have latest state from DB
-                session.expire_all()
-                await run_system_loop(session)
-                print("--- System Loop Complete ---")
-
-                if not continuous:
-                    break
-                await asyncio.sleep(5)
+            # Prompts are announced for review over NATS
+            nc = await nats.connect(os.getenv("NATS_URL", "nats://localhost:4222"))
+            try:
+                while True:
+                    print("\n--- Starting System Loop ---")
+                    # Refresh session to ensure we have latest state from DB
+                    session.expire_all()
+                    await run_system_loop(session, nc=nc)
+                    print("--- System Loop Complete ---")
+
+                    if not continuous:
+                        break
+                    await asyncio.sleep(5)
+
+                # The API thread dies with the process; keep it up until announced prompts are scored
+                if check_awaiting_prompts(session):
+                    print("Waiting for prompts to be scored via POST /human/reward (Ctrl+C to exit)...")
+                    while check_awaiting_prompts(session):
+                        await asyncio.sleep(5)
+            finally:
+                await nc.drain()
 
         asyncio.run(run_loop())
 
@@ -1,9 +1,9 @@
-import json
 import os
 import shutil
 import uuid
 
 import nats
+import orjson
 from sqlalchemy.orm import Session
 
 from syntropism.core.observability import extract_context, setup_tracing
@@ -16,6 +16,11 @@ tracer = setup_tracing("evolution-service")
 SPAWN_COST = 10.0
 
 
+def _workspace_root() -> str:
+    """Directory holding agent workspaces: $WORKSPACE_ROOT, or ./workspaces by default."""
+    return os.getenv("WORKSPACE_ROOT") or os.path.join(os.getcwd(), "workspaces")
+
+
 def _create_agent_with_workspace(
     session: Session,
     credit_balance: float,
@@ -54,7 +59,7 @@ def create_genesis_agent(session: Session) -> Agent:
     """
     Create the first agent with initial credits and workspace.
     """
-    workspace_root = os.path.join(os.getcwd(), "workspaces")
+    workspace_root = _workspace_root()
     os.makedirs(workspace_root, exist_ok=True)
     agent = _create_agent_with_workspace(
         session=session,
@@ -95,7 +100,7 @@ def spawn_child_agent(session: Session, parent_id: str, initial_credits: float,
     new_lineage = [parent_id] + parent.spawn_lineage
 
     child_id = str(uuid.uuid4())
-    workspace_root = os.path.join(os.getcwd(), "workspaces")
+    workspace_root = _workspace_root()
     os.makedirs(workspace_root, exist_ok=True)
     child = _create_agent_with_workspace(
         session=session,
@@ -141,13 +146,13 @@ class EvolutionManager:
     Manager for agent evolution, handling spawning requests via NATS.
     """
 
-    async def run_nats(self, nats_url: str = "nats://localhost:4222"):
+    async def run_nats(self, nats_url: str = "nats://localhost:4222", subject_prefix: str = ""):
         nc = await nats.connect(nats_url, connect_timeout=2)
 
         async def spawn_handler(msg):
             context = extract_context(msg.headers)
             with tracer.start_as_current_span("spawn_handler", context=context) as span:
-                data = json.loads(msg.data)
+                data = orjson.loads(msg.data)
                 parent_id = data.get("parent_id")
                 initial_credits = data.get("initial_credits", 50.0)
                 payload = data.get("payload", {})
@@ -156,10 +161,10 @@ class EvolutionManager:
                     try:
                         child = spawn_child_agent(session, parent_id, initial_credits, payload)
                         response = {"status": "success", "child_id": child.id, "workspace_id": child.workspace_id}
-                        await msg.respond(json.dumps(response).encode())
+                        await msg.respond(orjson.dumps(response))
                     except Exception as e:
                         span.record_exception(e)
-                        await msg.respond(json.dumps({"status": "error", "message": str(e)}).encode())
+                        await msg.respond(orjson.dumps({"status": "error", "message": str(e)}))
 
-        await nc.subscribe("evolution.spawn", cb=spawn_handler)
+        await nc.subscribe(f"{subject_prefix}evolution.spawn", cb=spawn_handler)
         return nc
@@ -12,8 +12,8 @@ def setup_tracing(service_name: str):
     try:
         # This will raise an error if no provider is set, or return the current one
         # However, trace.get_tracer_provider() always returns something (ProxyTracerProvider)
-        # We check if it's already a TracerProvider
-        if isinstance(trace.get_tracer_provider(), TracerProvider):
+        # We check if one was already installed, e.g. a TracerProvider or the test suite's NoOpTracerProvider
+        if not isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
             return trace.get_tracer(service_name)
     except Exception:
         pass
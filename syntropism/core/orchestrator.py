@@ -1,22 +1,24 @@
-import json
+import asyncio
 import os
-import sys
 from datetime import UTC, datetime
+from pathlib import Path
 
-from sqlalchemy.orm import Session
+import orjson
+from sqlalchemy import update
+from sqlalchemy.orm import Session, joinedload
 
 from syntropism.core.observability import inject_context, setup_tracing
 from syntropism.core.sandbox import ExecutionSandbox
 from syntropism.core.scheduler import AllocationScheduler
 from syntropism.domain.attention import AttentionManager
 from syntropism.domain.market import MarketManager
-from syntropism.domain.models import Agent, AgentStatus, Bid, BidStatus, Execution, Workspace
+from syntropism.domain.models import Agent, AgentStatus, Bid, BidStatus, PromptStatus, Workspace
 
 # Initialize OTEL
 tracer = setup_tracing("orchestrator")
 
 
-async def run_system_loop(session: Session, nc=None):
+async def run_system_loop(session: Session, nc=None, subject_prefix: str = ""):
     """
     Main system loop that orchestrates the agent economy.
 
@@ -24,15 +26,35 @@ async def run_system_loop(session: Session, nc=None):
     1. Allocation: Run allocation cycle to assign resources to winning bids
     2. Execution: Execute all winning bids
     3. Market Update: Adjust prices based on utilization
-    4. Attention: Process pending prompts and collect human scores
+    4. Attention: Publish pending prompts for human review (scores are submitted separately)
+
+    subject_prefix is prepended to every subject published on, e.g. to namespace a test worker.
     """
-    from syntropism.domain.events import ExecutionStarted, ExecutionTerminated, ReasoningTrace
+    from syntropism.domain.events import (
+        ExecutionStarted,
+        ExecutionTerminated,
+        PromptReviewRequested,
+        ReasoningTrace,
+    )
 
     # Step 1: Allocation
-    await AllocationScheduler.run_allocation_cycle(session, nc=nc)
+    await AllocationScheduler.run_allocation_cycle(session, nc=nc, subject_prefix=subject_prefix)
 
     # Step 2: Execution - find all WINNING bids and execute them
-    winning_bids = session.query(Bid).filter_by(status=BidStatus.WINNING).all()
+    # Agent, bundle and execution are joined in up front so the loop below doesn't lazy-load per bid
+    winning_bids = (
+        session.query(Bid)
+        .options(joinedload(Bid.agent), joinedload(Bid.resource_bundle), joinedload(Bid.execution))
+        .filter_by(status=BidStatus.WINNING)
+        .all()
+    )
+
+    # Fetch every workspace for the winning agents in one query
+    workspaces = {}
+    if winning_bids:
+        agent_ids = {bid.from_agent_id for bid in winning_bids}
+        for ws in session.query(Workspace).filter(Workspace.agent_id.in_(agent_ids)):
+            workspaces.setdefault(ws.agent_id, ws)
 
     for bid in winning_bids:
         with tracer.start_as_current_span("agent_execution") as span:
@@ -40,7 +62,7 @@ async def run_system_loop(session: Session, nc=None):
             span.set_attribute("openinference.span.kind", "AGENT")
             span.set_attribute("agent.id", agent.id)
 
-            workspace = session.query(Workspace).filter_by(agent_id=agent.id).first()
+            workspace = workspaces.get(agent.id)
 
         if not workspace:
             continue
@@ -55,8 +77,7 @@ async def run_system_loop(session: Session, nc=None):
             "attention_share": bid.resource_bundle.attention_percent or bid.resource_bundle.attention_share,
         }
         env_json_path = os.path.join(workspace_path, "env.json")
-        with open(env_json_path, "w") as f:
-            json.dump(env_data, f, indent=2)
+        await asyncio.to_thread(Path(env_json_path).write_bytes, orjson.dumps(env_data, option=orjson.OPT_INDENT_2))
 
         # Run the agent in sandbox
         debug_mode = os.getenv("DEBUG") == "1"
@@ -72,7 +93,9 @@ async def run_system_loop(session: Session, nc=None):
             )
             headers = {}
             inject_context(headers)
-            await nc.publish("system.execution.started", event.model_dump_json().encode(), headers=headers)
+            await nc.publish(
+                f"{subject_prefix}system.execution.started", event.model_dump_json().encode(), headers=headers
+            )
 
         sandbox = ExecutionSandbox(debug=debug_mode)
         exit_code, logs = sandbox.run_agent(
@@ -91,7 +114,7 @@ async def run_system_loop(session: Session, nc=None):
         bid.status = BidStatus.COMPLETED
 
         # Update execution record
-        execution = session.query(Execution).filter_by(id=bid.execution_id).first()
+        execution = bid.execution
         if execution:
             execution.status = "COMPLETED" if exit_code == 0 else "FAILED"
             execution.exit_code = exit_code
@@ -108,7 +131,9 @@ async def run_system_loop(session: Session, nc=None):
             )
             headers = {}
             inject_context(headers)
-            await nc.publish("system.execution.terminated", event.model_dump_json().encode(), headers=headers)
+            await nc.publish(
+                f"{subject_prefix}system.execution.terminated", event.model_dump_json().encode(), headers=headers
+            )
 
         # NEW: Capture ReasoningTrace if reasoning.txt exists in workspace
         reasoning_path = os.path.join(workspace_path, "reasoning.txt")
@@ -120,7 +145,11 @@ async def run_system_loop(session: Session, nc=None):
                     trace_event = ReasoningTrace(agent_id=agent.id, content=reasoning_content)
                     headers = {}
                     inject_context(headers)
-                    await nc.publish("system.agent.reasoning", trace_event.model_dump_json().encode(), headers=headers)
+                    await nc.publish(
+                        f"{subject_prefix}system.agent.reasoning",
+                        trace_event.model_dump_json().encode(),
+                        headers=headers,
+                    )
             except Exception as e:
                 span.record_exception(e)
                 print(f"Error reading reasoning.txt for agent {agent.id}: {e}")
@@ -128,7 +157,8 @@ async def run_system_loop(session: Session, nc=None):
     # Step 3: Market Update - adjust prices based on utilization
     MarketManager.update_prices(session)
 
-    # Step 4: Attention - process pending prompts
+    # Step 4: Attention - hand pending prompts to the human out-of-band.
+    # Scores arrive later via /human/reward or the human.reward subject, so the loop never blocks on them.
     prompts = AttentionManager.get_pending_prompts(session)
 
     for prompt in prompts:
@@ -139,38 +169,33 @@ async def run_system_loop(session: Session, nc=None):
                 print(f"  {key}: {value}")
         else:
             print(f"  {prompt.content}")
+        print(f"  (score with POST /human/reward, prompt_id={prompt.id}; GET /human/prompts lists unscored prompts)")
         print("=" * 50)
 
-        # Get scores from human
-        while True:
-            try:
-                scores_input = input("Enter scores (interesting useful understandable) 0-10, separated by spaces: ")
-                parts = scores_input.strip().split()
-                if len(parts) == 3:
-                    interesting, useful, understandable = float(parts[0]), float(parts[1]), float(parts[2])
-                    if all(0 <= s <= 10 for s in [interesting, useful, understandable]):
-                        break
-                print("Invalid input. Please enter three numbers between 0 and 10.")
-            except (ValueError, EOFError):
-                if isinstance(sys.stdin, type(None)) or not sys.stdin.isatty():
-                    print("Non-interactive environment detected, using default scores (5 5 5).")
-                    interesting, useful, understandable = 5.0, 5.0, 5.0
-                    break
-                print("Invalid input. Please enter numbers between 0 and 10.")
-
-        # Reward the prompt
-        AttentionManager.reward_prompt(
-            session=session,
-            prompt_id=prompt.id,
-            interesting=interesting,
-            useful=useful,
-            understandable=understandable,
-        )
+        if nc:
+            event = PromptReviewRequested(
+                prompt_id=prompt.id,
+                agent_id=prompt.from_agent_id,
+                content=prompt.content,
+                bid_amount=prompt.bid_amount,
+            )
+            headers = {}
+            inject_context(headers)
+            await nc.publish(f"{subject_prefix}human.prompt.review", event.model_dump_json().encode(), headers=headers)
+
+            # Announced and awaiting a human response; not picked up again by later loops. Nothing persists the
+            # announcement, so a reviewer who wasn't listening finds it through GET /human/prompts until it's scored.
+            # Without NATS nothing was announced, so the prompt stays queued.
+            prompt.status = PromptStatus.ACTIVE
 
     # NEW: Step 5: Death Check - mark agents with no credits as DEAD
-    dead_agents = session.query(Agent).filter(Agent.credit_balance <= 0, Agent.status == AgentStatus.ALIVE).all()
-    for agent in dead_agents:
-        print(f"Agent {agent.id} has run out of credits and died.")
-        agent.status = AgentStatus.DEAD
+    dead_agent_ids = session.execute(
+        update(Agent)
+        .where(Agent.credit_balance <= 0, Agent.status == AgentStatus.ALIVE)
+        .values(status=AgentStatus.DEAD)
+        .returning(Agent.id)
+    ).scalars()
+    for agent_id in dead_agent_ids:
+        print(f"Agent {agent_id} has run out of credits and died.")
 
     session.commit()
@@ -46,6 +46,8 @@ class ExecutionSandbox:
             "AGENT_ID": agent_id,
             "SYSTEM_SERVICE_URL": self.system_service_url,
             "NATS_URL": os.getenv("NATS_URL", "nats://host.docker.internal:4222"),
+            # Agents request on the same subject namespace the system's handlers subscribe under
+            "NATS_SUBJECT_PREFIX": os.getenv("NATS_SUBJECT_PREFIX", ""),
             "PYTHONPATH": "/system:/workspace:$PYTHONPATH",  # Ensure /system and /workspace are in path
         }
 
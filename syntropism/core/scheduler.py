@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from syntropism.core.observability import inject_context, setup_tracing
 from syntropism.domain.market import ResourceType
@@ -12,7 +12,9 @@ class AllocationScheduler:
     LLM_SPEND_LIMIT = 10000  # 100% capacity for tokens
 
     @staticmethod
-    async def place_bid(session: Session, agent_id: str, bundle_id: str, amount: float, nc=None) -> Bid:
+    async def place_bid(
+        session: Session, agent_id: str, bundle_id: str, amount: float, nc=None, subject_prefix: str = ""
+    ) -> Bid:
         from syntropism.domain.events import BidPlaced
 
         agent = session.query(Agent).filter_by(id=agent_id).first()
@@ -34,7 +36,9 @@ class AllocationScheduler:
             event = BidPlaced(agent_id=agent_id, amount=amount, resource_bundle_id=bundle_id)
             headers = {}
             inject_context(headers)
-            await nc.publish("system.market.bid_placed", event.model_dump_json().encode(), headers=headers)
+            await nc.publish(
+                f"{subject_prefix}system.market.bid_placed", event.model_dump_json().encode(), headers=headers
+            )
 
         return bid
 
@@ -43,10 +47,16 @@ class AllocationScheduler:
         return session.query(Bid).filter_by(from_agent_id=agent_id).order_by(Bid.timestamp.desc()).all()
 
     @staticmethod
-    async def run_allocation_cycle(session: Session, nc=None):
+    async def run_allocation_cycle(session: Session, nc=None, subject_prefix: str = ""):
         from syntropism.domain.events import BidProcessed, BidRejected, PriceDiscovered
 
-        pending_bids = session.query(Bid).filter_by(status=BidStatus.PENDING).all()
+        # Bundle and agent are read for every bid below; join them in rather than lazy-loading per bid
+        pending_bids = (
+            session.query(Bid)
+            .options(joinedload(Bid.agent), joinedload(Bid.resource_bundle))
+            .filter_by(status=BidStatus.PENDING)
+            .all()
+        )
 
         # Sort by price (highest first)
         pending_bids.sort(key=lambda x: x.amount, reverse=True)
@@ -110,7 +120,11 @@ class AllocationScheduler:
                     )
                     headers = {}
                     inject_context(headers)
-                    await nc.publish("system.market.bid_rejected", reject_event.model_dump_json().encode(), headers=headers)
+                    await nc.publish(
+                        f"{subject_prefix}system.market.bid_rejected",
+                        reject_event.model_dump_json().encode(),
+                        headers=headers,
+                    )
 
             # Emit event
             if nc:
@@ -123,7 +137,9 @@ class AllocationScheduler:
                 )
                 headers = {}
                 inject_context(headers)
-                await nc.publish("system.market.bid_processed", event.model_dump_json().encode(), headers=headers)
+                await nc.publish(
+                    f"{subject_prefix}system.market.bid_processed", event.model_dump_json().encode(), headers=headers
+                )
 
         # Update MarketState utilization and price in DB
         for ms in market_states_objs:
@@ -143,6 +159,10 @@ class AllocationScheduler:
                     )
                     headers = {}
                     inject_context(headers)
-                    await nc.publish("system.market.price_discovered", event.model_dump_json().encode(), headers=headers)
+                    await nc.publish(
+                        f"{subject_prefix}system.market.price_discovered",
+                        event.model_dump_json().encode(),
+                        headers=headers,
+                    )
 
         session.commit()
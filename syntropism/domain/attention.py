@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from syntropism.domain.models import Agent, Execution, Prompt, PromptStatus, Response, Transaction
 
@@ -13,7 +13,12 @@ class AttentionManager:
             raise ValueError("Bid amount must be non-negative")
 
         # Fetch the Execution by execution_id
-        execution = session.query(Execution).filter(Execution.id == execution_id).first()
+        execution = (
+            session.query(Execution)
+            .options(joinedload(Execution.resource_bundle))
+            .filter(Execution.id == execution_id)
+            .first()
+        )
         if not execution:
             raise ValueError(f"Execution {execution_id} not found")
 
@@ -58,6 +63,16 @@ class AttentionManager:
             session.query(Prompt).filter(Prompt.status == PromptStatus.PENDING).order_by(Prompt.bid_amount.desc()).all()
         )
 
+    @staticmethod
+    def get_awaiting_prompts(session: Session) -> list[Prompt]:
+        """Prompts still waiting for a human score: queued (PENDING) or already announced (ACTIVE)."""
+        return (
+            session.query(Prompt)
+            .filter(Prompt.status.in_([PromptStatus.PENDING, PromptStatus.ACTIVE]))
+            .order_by(Prompt.bid_amount.desc())
+            .all()
+        )
+
     @staticmethod
     def reward_prompt(
         session: Session, prompt_id: str, interesting: float, useful: float, understandable: float, reason: str = None
@@ -16,12 +16,14 @@ Usage in Agent:
 
 from __future__ import annotations
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class PromptRequest(BaseModel):
     """Schema for an agent requesting human attention."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     agent_id: str = Field(..., description="The ID of the agent submitting the prompt")
     execution_id: str = Field(..., description="The ID of the execution context")
     content: dict = Field(..., description="The content of the prompt (e.g., {'text': '...'})")
@@ -31,6 +33,8 @@ class PromptRequest(BaseModel):
 class BidRequest(BaseModel):
     """Schema for an agent bidding on resources."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     agent_id: str = Field(..., description="The ID of the agent")
     amount: float = Field(..., ge=0, description="Bid amount in credits")
     cpu_seconds: float | None = Field(0.0, ge=0)
@@ -59,6 +63,8 @@ class BidRequest(BaseModel):
 class RewardScores(BaseModel):
     """Schema for human scores on a prompt."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     interesting: float = Field(..., ge=0, le=10)
     useful: float = Field(..., ge=0, le=10)
     understandable: float = Field(..., ge=0, le=10)
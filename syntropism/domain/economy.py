@@ -1,6 +1,5 @@
-import json
-
 import nats
+import orjson
 from sqlalchemy.orm import Session
 
 from syntropism.core.observability import extract_context, inject_context, setup_tracing
@@ -17,7 +16,9 @@ class EconomicEngine:
     """
 
     @staticmethod
-    async def transfer_credits(session: Session, from_id: str, to_id: str, amount: float, memo: str, nc=None):
+    async def transfer_credits(
+        session: Session, from_id: str, to_id: str, amount: float, memo: str, nc=None, subject_prefix: str = ""
+    ):
         """
         Transfer credits from one agent to another.
         """
@@ -57,7 +58,9 @@ class EconomicEngine:
             event = CreditsBurned(agent_id=from_id, amount=amount, reason=memo)
             headers = {}
             inject_context(headers)
-            await nc.publish("system.economy.credits_burned", event.model_dump_json().encode(), headers=headers)
+            await nc.publish(
+                f"{subject_prefix}system.economy.credits_burned", event.model_dump_json().encode(), headers=headers
+            )
 
     @staticmethod
     def get_balance(session: Session, agent_id: str) -> float:
@@ -81,7 +84,7 @@ class EconomicEngine:
             .all()
         )
 
-    async def run_nats(self, nats_url: str = "nats://localhost:4222"):
+    async def run_nats(self, nats_url: str = "nats://localhost:4222", subject_prefix: str = ""):
         nc = await nats.connect(nats_url, connect_timeout=2)
 
         async def balance_handler(msg):
@@ -95,10 +98,10 @@ class EconomicEngine:
                     try:
                         balance = self.get_balance(session, agent_id)
                         response = {"agent_id": agent_id, "balance": balance}
-                        await msg.respond(json.dumps(response).encode())
+                        await msg.respond(orjson.dumps(response))
                     except ValueError as e:
                         span.record_exception(e)
-                        await msg.respond(json.dumps({"error": str(e)}).encode())
+                        await msg.respond(orjson.dumps({"error": str(e)}))
 
-        await nc.subscribe("economic.balance.*", cb=balance_handler)
+        await nc.subscribe(f"{subject_prefix}economic.balance.*", cb=balance_handler)
         return nc
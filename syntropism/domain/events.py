@@ -87,6 +87,13 @@ class CodeChangeApplied(SystemEvent):
     target_module: str
 
 
+class PromptReviewRequested(SystemEvent):
+    prompt_id: str
+    agent_id: str
+    content: dict | str
+    bid_amount: float
+
+
 class BidPlaced(SystemEvent):
     agent_id: str
     amount: float
@@ -1,7 +1,7 @@
 import enum
-import json
 
 import nats
+import orjson
 from sqlalchemy.orm import Session
 
 from syntropism.domain.models import MarketState, ResourceBundle
@@ -41,7 +41,7 @@ class MarketManager:
     def get_market_state(session: Session, resource_type: ResourceType) -> MarketState:
         return session.query(MarketState).filter_by(resource_type=resource_type.value).first()
 
-    async def run_nats(self, nats_url: str = "nats://localhost:4222"):
+    async def run_nats(self, nats_url: str = "nats://localhost:4222", subject_prefix: str = ""):
         nc = await nats.connect(nats_url, connect_timeout=2)
 
         async def market_state_handler(msg):
@@ -57,16 +57,16 @@ class MarketManager:
                             "price": state.current_market_price,
                             "utilization": state.current_utilization,
                         }
-                        await msg.respond(json.dumps(response).encode())
+                        await msg.respond(orjson.dumps(response))
                     else:
-                        await msg.respond(json.dumps({"error": "Resource type not found"}).encode())
+                        await msg.respond(orjson.dumps({"error": "Resource type not found"}))
             except ValueError:
-                await msg.respond(json.dumps({"error": "Invalid resource type"}).encode())
+                await msg.respond(orjson.dumps({"error": "Invalid resource type"}))
 
         async def market_bid_handler(msg):
             from syntropism.core.scheduler import AllocationScheduler
 
-            data = json.loads(msg.data)
+            data = orjson.loads(msg.data)
             with SessionLocal() as session:
                 try:
                     # Create bundle if not provided
@@ -83,12 +83,12 @@ class MarketManager:
                         bundle_id = bundle.id
 
                     bid = await AllocationScheduler.place_bid(
-                        session, data["agent_id"], bundle_id, data["amount"], nc=nc
+                        session, data["agent_id"], bundle_id, data["amount"], nc=nc, subject_prefix=subject_prefix
                     )
-                    await msg.respond(json.dumps({"status": "success", "bid_id": bid.id}).encode())
+                    await msg.respond(orjson.dumps({"status": "success", "bid_id": bid.id}))
                 except Exception as e:
-                    await msg.respond(json.dumps({"status": "error", "message": str(e)}).encode())
+                    await msg.respond(orjson.dumps({"status": "error", "message": str(e)}))
 
-        await nc.subscribe("market.state.*", cb=market_state_handler)
-        await nc.subscribe("market.bid", cb=market_bid_handler)
+        await nc.subscribe(f"{subject_prefix}market.state.*", cb=market_state_handler)
+        await nc.subscribe(f"{subject_prefix}market.bid", cb=market_bid_handler)
         return nc
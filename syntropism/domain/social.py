@@ -1,6 +1,8 @@
-import json
+from collections.abc import Callable
+from functools import partial
 
 import nats
+import orjson
 from sqlalchemy.orm import Session
 
 from syntropism.core.genesis import spawn_child_agent
@@ -21,44 +23,61 @@ class SocialManager:
     def spawn_agent(session: Session, parent_id: str, initial_credits: float, payload: dict = None):
         return spawn_child_agent(session, parent_id, initial_credits, payload)
 
-    async def run_nats(self, nats_url: str = "nats://localhost:4222"):
-        nc = await nats.connect(nats_url, connect_timeout=2)
+    @staticmethod
+    def _message_op(session: Session, data: dict) -> dict:
+        message = SocialManager.send_message(session, data["from_id"], data["to_id"], data["content"])
+        return {"status": "success", "message_id": message.id}
 
-        async def message_handler(msg):
-            data = json.loads(msg.data)
-            with SessionLocal() as session:
-                try:
-                    message = self.send_message(session, data["from_id"], data["to_id"], data["content"])
-                    await msg.respond(json.dumps({"status": "success", "message_id": message.id}).encode())
-                except Exception as e:
-                    await msg.respond(json.dumps({"status": "error", "message": str(e)}).encode())
+    @staticmethod
+    def _spawn_op(session: Session, data: dict) -> dict:
+        child = SocialManager.spawn_agent(session, data["parent_id"], data["initial_credits"], data.get("payload"))
+        return {"status": "success", "child_id": child.id, "workspace_id": child.workspace_id}
 
-        async def spawn_handler(msg):
-            data = json.loads(msg.data)
-            with SessionLocal() as session:
-                try:
-                    child = self.spawn_agent(session, data["parent_id"], data["initial_credits"], data.get("payload"))
-                    await msg.respond(
-                        json.dumps(
-                            {"status": "success", "child_id": child.id, "workspace_id": child.workspace_id}
-                        ).encode()
-                    )
-                except Exception as e:
-                    await msg.respond(json.dumps({"status": "error", "message": str(e)}).encode())
+    @staticmethod
+    def _prompt_op(session: Session, data: dict) -> dict:
+        prompt = AttentionManager.submit_prompt(
+            session, data["agent_id"], data["execution_id"], data["content"], data["bid_amount"]
+        )
+        session.commit()
+        return {"status": "success", "prompt_id": prompt.id}
 
-        async def prompt_handler(msg):
-            data = json.loads(msg.data)
+    @staticmethod
+    def _reward_op(session: Session, data: dict) -> dict:
+        response = AttentionManager.reward_prompt(
+            session,
+            data["prompt_id"],
+            data["interesting"],
+            data["useful"],
+            data["understandable"],
+            data.get("reason"),
+        )
+        session.commit()
+        return {"status": "success", "credits_awarded": response.credits_awarded}
+
+    @staticmethod
+    async def _dispatch(msg, op: Callable[[Session, dict], dict]):
+        """
+        Shared request handler: parse the payload, run `op` in a fresh session and respond.
+        Any failure is reported back to the requester as an error response.
+        """
+        loads, dumps = orjson.loads, orjson.dumps
+        try:
+            data = loads(msg.data)
             with SessionLocal() as session:
-                try:
-                    prompt = AttentionManager.submit_prompt(
-                        session, data["agent_id"], data["execution_id"], data["content"], data["bid_amount"]
-                    )
-                    session.commit()
-                    await msg.respond(json.dumps({"status": "success", "prompt_id": prompt.id}).encode())
-                except Exception as e:
-                    await msg.respond(json.dumps({"status": "error", "message": str(e)}).encode())
+                response = op(session, data)
+        except Exception as e:
+            response = {"status": "error", "message": str(e)}
+        await msg.respond(dumps(response))
+
+    async def run_nats(self, nats_url: str = "nats://localhost:4222", subject_prefix: str = ""):
+        nc = await nats.connect(nats_url, connect_timeout=2)
 
-        await nc.subscribe("social.message", cb=message_handler)
-        await nc.subscribe("social.spawn", cb=spawn_handler)
-        await nc.subscribe("human.prompt", cb=prompt_handler)
+        handlers = {
+            "social.message": self._message_op,
+            "social.spawn": self._spawn_op,
+            "human.prompt": self._prompt_op,
+            "human.reward": self._reward_op,
+        }
+        for subject, op in handlers.items():
+            await nc.subscribe(f"{subject_prefix}{subject}", cb=partial(self._dispatch, op=op))
         return nc
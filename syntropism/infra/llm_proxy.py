@@ -2,15 +2,25 @@
 LLM Proxy Service Module
 
 This module implements the LLM Proxy service that:
-- Exposes a /llm endpoint for routing requests
+- Exposes a /llm endpoint for routing requests, and /llm/stream for incremental output
 - Enforces token quotas
+- Caches responses for identical requests
 - Logs all interactions
 """
 
+import enum
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+
+import orjson
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from loguru import logger
 from opentelemetry import trace
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from syntropism.core.observability import extract_context, setup_tracing
 
@@ -19,23 +29,94 @@ tracer = setup_tracing("llm-proxy")
 
 router = APIRouter()
 
+# Upper bounds on in-memory state; least recently used entries are evicted first
+MAX_CLIENTS = 100_000
+MAX_CACHED_RESPONSES = 10_000
+
 # Token quota tracking (in-memory for stub implementation)
-token_quotas = {}
+token_quotas = OrderedDict()
+
+
+class CachePolicy(enum.Enum):
+    ENABLED = "enabled"  # Serve hits, store misses
+    REPLAY = "replay"  # Serve hits only; a miss is an error
+    WRITE_ONLY = "write_only"  # Always call upstream, store the result
+    DISABLED = "disabled"
+
+
+CACHE_POLICY = CachePolicy(os.getenv("LLM_CACHE_POLICY", CachePolicy.ENABLED.value))
+
+# Response cache keyed by SHA256 of the request parameters
+response_cache = OrderedDict()
+
+
+def _lru_get(store: OrderedDict, key, default=None):
+    """Look up a key and mark it as most recently used."""
+    if key not in store:
+        return default
+    store.move_to_end(key)
+    return store[key]
+
+
+def _lru_set(store: OrderedDict, key, value, max_size: int):
+    """Insert or update a key, evicting the least recently used entries beyond max_size."""
+    store[key] = value
+    store.move_to_end(key)
+    while len(store) > max_size:
+        store.popitem(last=False)
 
 
 class LLMRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     prompt: str
     model: str
     max_tokens: int | None = 1000
 
 
 class LLMResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     response: str
     tokens_used: int
     model: str
 
 
-@router.post("/llm")
+def cache_key(request: LLMRequest) -> bytes:
+    """
+    Deterministic cache key for an LLM request.
+    The fields are JSON-encoded rather than joined with a separator, so a prompt or model name containing
+    the separator can't make two different requests collide.
+    """
+    return hashlib.sha256(orjson.dumps([request.prompt, request.model, request.max_tokens])).digest()
+
+
+def _reserve_tokens(client_id: str, requested_tokens: int, span):
+    """
+    Charge requested tokens against the client's quota, raising 429 if it would be exceeded.
+    """
+    current_usage = _lru_get(token_quotas, client_id, 0)
+
+    if current_usage + requested_tokens > 10000:  # Example quota limit
+        logger.warning(f"[component:llm_proxy] Token quota exceeded for client {client_id}")
+        span.set_status(trace.Status(trace.StatusCode.ERROR, "Token quota exceeded"))
+        raise HTTPException(status_code=429, detail="Token quota exceeded")
+
+    # Update token usage
+    _lru_set(token_quotas, client_id, current_usage + requested_tokens, MAX_CLIENTS)
+
+
+async def stream_completion(request: LLMRequest) -> AsyncIterator[str]:
+    """
+    Yield completion chunks as they arrive from the provider.
+    Stub implementation - yields the stub response word by word.
+    """
+    for chunk in re.split(r"(?<= )", f"Stub response for prompt: {request.prompt}"):
+        yield chunk
+
+
+# response_model lets pydantic-core serialize the result directly; orjson then encodes it
+@router.post("/llm", response_model=LLMResponse, response_class=ORJSONResponse)
 async def handle_llm_request(request: LLMRequest, req: Request):
     """
     Handle LLM proxy requests with token quota enforcement and logging.
@@ -52,17 +133,28 @@ async def handle_llm_request(request: LLMRequest, req: Request):
         span.set_attribute("llm.input_messages.0.message.role", "user")
         span.set_attribute("llm.input_messages.0.message.content", request.prompt)
 
-        # Check and enforce token quotas
-        current_usage = token_quotas.get(client_id, 0)
-        requested_tokens = request.max_tokens or 1000
+        # Serve identical requests from the cache without touching the quota
+        key = cache_key(request)
+        if CACHE_POLICY in (CachePolicy.ENABLED, CachePolicy.REPLAY):
+            cached = _lru_get(response_cache, key)
+            if cached is not None:
+                logger.info(f"[component:llm_proxy] LLM cache hit for {client_id}, model {request.model}")
+                span.set_attribute("llm.cache_hit", True)
+                span.set_attribute("llm.output_messages.0.message.role", "assistant")
+                span.set_attribute("llm.output_messages.0.message.content", cached.response)
+                span.set_attribute("llm.token_count.total", cached.tokens_used)
+                return cached
 
-        if current_usage + requested_tokens > 10000:  # Example quota limit
-            logger.warning(f"[component:llm_proxy] Token quota exceeded for client {client_id}")
-            span.set_status(trace.Status(trace.StatusCode.ERROR, "Token quota exceeded"))
-            raise HTTPException(status_code=429, detail="Token quota exceeded")
+            if CACHE_POLICY == CachePolicy.REPLAY:
+                logger.warning(f"[component:llm_proxy] LLM cache miss in replay mode for client {client_id}")
+                span.set_status(trace.Status(trace.StatusCode.ERROR, "Cache miss in replay mode"))
+                raise HTTPException(status_code=404, detail="No cached response in replay mode")
 
-        # Update token usage
-        token_quotas[client_id] = current_usage + requested_tokens
+        span.set_attribute("llm.cache_hit", False)
+
+        # Check and enforce token quotas
+        requested_tokens = request.max_tokens or 1000
+        _reserve_tokens(client_id, requested_tokens, span)
 
         # Log interaction
         logger.debug(
@@ -79,7 +171,75 @@ async def handle_llm_request(request: LLMRequest, req: Request):
 
         logger.info(f"[component:llm_proxy] LLM response generated for {client_id}, tokens used: {requested_tokens}")
 
-        return LLMResponse(response=response_text, tokens_used=requested_tokens, model=request.model)
+        response = LLMResponse(response=response_text, tokens_used=requested_tokens, model=request.model)
+        if CACHE_POLICY in (CachePolicy.ENABLED, CachePolicy.WRITE_ONLY):
+            _lru_set(response_cache, key, response, MAX_CACHED_RESPONSES)
+
+        return response
+
+
+@router.post("/llm/stream")
+async def stream_llm_request(request: LLMRequest, req: Request):
+    """
+    Stream an LLM completion as newline-delimited JSON: one {"token": ...} line per chunk,
+    then a final {"done": true, ...} line. The cache policy applies as it does for /llm.
+    """
+    context = extract_context(dict(req.headers))
+    with tracer.start_as_current_span("llm_stream_request", context=context) as span:
+        client_id = req.client.host if req.client else "unknown"
+
+        logger.info(f"[component:llm_proxy] LLM stream request received from {client_id} for model {request.model}")
+
+        span.set_attribute("openinference.span.kind", "LLM")
+        span.set_attribute("llm.model_name", request.model)
+        span.set_attribute("llm.input_messages.0.message.role", "user")
+        span.set_attribute("llm.input_messages.0.message.content", request.prompt)
+
+        # Serve identical requests from the cache without touching the quota
+        key = cache_key(request)
+        cached = None
+        if CACHE_POLICY in (CachePolicy.ENABLED, CachePolicy.REPLAY):
+            cached = _lru_get(response_cache, key)
+            if cached is not None:
+                logger.info(f"[component:llm_proxy] LLM cache hit for {client_id}, model {request.model}")
+            elif CACHE_POLICY == CachePolicy.REPLAY:
+                logger.warning(f"[component:llm_proxy] LLM cache miss in replay mode for client {client_id}")
+                span.set_status(trace.Status(trace.StatusCode.ERROR, "Cache miss in replay mode"))
+                raise HTTPException(status_code=404, detail="No cached response in replay mode")
+
+        span.set_attribute("llm.cache_hit", cached is not None)
+
+        requested_tokens = request.max_tokens or 1000
+        if cached is None:
+            _reserve_tokens(client_id, requested_tokens, span)
+
+    async def ndjson_chunks():
+        dumps = orjson.dumps
+        # The request span ends once headers are sent; this child covers the streamed output
+        with tracer.start_as_current_span(
+            "llm_stream_response", context=trace.set_span_in_context(span)
+        ) as stream_span:
+            if cached is not None:
+                response_text, tokens_used = cached.response, cached.tokens_used
+                yield dumps({"token": response_text}) + b"\n"
+            else:
+                chunks = []
+                async for chunk in stream_completion(request):
+                    chunks.append(chunk)
+                    yield dumps({"token": chunk}) + b"\n"
+                response_text, tokens_used = "".join(chunks), requested_tokens
+
+                if CACHE_POLICY in (CachePolicy.ENABLED, CachePolicy.WRITE_ONLY):
+                    response = LLMResponse(response=response_text, tokens_used=tokens_used, model=request.model)
+                    _lru_set(response_cache, key, response, MAX_CACHED_RESPONSES)
+
+            stream_span.set_attribute("llm.output_messages.0.message.role", "assistant")
+            stream_span.set_attribute("llm.output_messages.0.message.content", response_text)
+            stream_span.set_attribute("llm.token_count.total", tokens_used)
+
+            yield dumps({"done": True, "tokens_used": tokens_used, "model": request.model}) + b"\n"
+
+    return StreamingResponse(ndjson_chunks(), media_type="application/x-ndjson")
 
 
 @router.get("/llm/quota/{client_id}")
@@ -87,7 +247,7 @@ async def get_quota(client_id: str):
     """
     Get current token quota usage for a client.
     """
-    usage = token_quotas.get(client_id, 0)
+    usage = _lru_get(token_quotas, client_id, 0)
     return {"client_id": client_id, "tokens_used": usage, "quota_limit": 10000}
 
 
@@ -96,6 +256,6 @@ async def reset_quota(client_id: str):
     """
     Reset token quota for a client (admin operation).
     """
-    token_quotas[client_id] = 0
+    _lru_set(token_quotas, client_id, 0, MAX_CLIENTS)
     logger.info(f"[component:llm_proxy] Token quota reset for client {client_id}")
     return {"status": "quota_reset", "client_id": client_id}
@@ -1,7 +1,7 @@
 import asyncio
-import json
 
 import nats
+import orjson
 from loguru import logger
 
 from syntropism.core.observability import extract_context, setup_tracing
@@ -11,8 +11,14 @@ tracer = setup_tracing("mcp-gateway")
 
 
 class MCPGateway:
-    def __init__(self, nats_url: str = "nats://localhost:4222"):
+    def __init__(self, nats_url: str = "nats://localhost:4222", subject_prefix: str = ""):
         self.nats_url = nats_url
+        self.subject = f"{subject_prefix}mcp.request.*"
+        # Stream and durable names can't contain dots; namespace them like the subject so gateways
+        # with different prefixes never share a stream or pull from the same consumer
+        name_prefix = subject_prefix.replace(".", "_")
+        self.stream_name = f"{name_prefix}mcp_requests"
+        self.durable_name = f"{name_prefix}mcp_gateway_consumer"
         self.nc = None
         self.js = None
 
@@ -23,12 +29,12 @@ class MCPGateway:
 
     async def setup_stream(self):
         # Create stream for MCP requests
-        await self.js.add_stream(name="mcp_requests", subjects=["mcp.request.*"])
-        logger.info("MCPGateway setup stream 'mcp_requests'")
+        await self.js.add_stream(name=self.stream_name, subjects=[self.subject])
+        logger.info(f"MCPGateway setup stream '{self.stream_name}'")
 
     async def run(self, max_msgs: int | None = None):
         # Pull consumer
-        sub = await self.js.pull_subscribe("mcp.request.*", "mcp_gateway_consumer")
+        sub = await self.js.pull_subscribe(self.subject, self.durable_name)
 
         logger.info("MCPGateway started pulling requests...")
         msgs_processed = 0
@@ -40,13 +46,14 @@ class MCPGateway:
                 for msg in msgs:
                     context = extract_context(msg.headers)
                     with tracer.start_as_current_span("mcp_request_handler", context=context) as span:
-                        data = json.loads(msg.data)
+                        data = orjson.loads(msg.data)
                         logger.info(f"MCPGateway received request: {data}")
 
-                        # OpenInference Tool Instrumentation
-                        span.set_attribute("openinference.span.kind", "TOOL")
-                        span.set_attribute("tool.name", data.get("tool", "unknown"))
-                        span.set_attribute("tool.parameters", json.dumps(data.get("parameters", {})))
+                        # OpenInference Tool Instrumentation (skip building attributes for unsampled spans)
+                        if span.is_recording():
+                            span.set_attribute("openinference.span.kind", "TOOL")
+                            span.set_attribute("tool.name", data.get("tool", "unknown"))
+                            span.set_attribute("tool.parameters", orjson.dumps(data.get("parameters", {})).decode())
 
                         # Here we would forward to MCP server
                         # For now, just ack
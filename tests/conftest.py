@@ -1,8 +1,135 @@
+import importlib.util
+import os
 import socket
 import subprocess
 import time
 
+import nats
 import pytest
+import pytest_asyncio
+from opentelemetry import trace
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from syntropism.domain import models  # noqa: F401  (registers the tables on Base.metadata)
+from syntropism.infra.database import Base
+
+# Tests don't export spans: pin the global provider to a no-op before any module calls setup_tracing.
+# Tracing tests create spans on their own in-memory TracerProvider instead.
+trace.set_tracer_provider(trace.NoOpTracerProvider())
+
+# Run async tests on uvloop when it is installed; it is unavailable on Windows, where the default loop is kept
+if importlib.util.find_spec("uvloop"):
+
+    @pytest.fixture(scope="session")
+    def event_loop_policy():
+        import uvloop
+
+        return uvloop.EventLoopPolicy()
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test on the session event loop, alongside session-scoped fixtures."""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """In-memory SQLite database shared by every test in the session; the schema is built once."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite's implicit transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN itself
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        # Temp tables in memory and a 64 MB page cache. synchronous, locking_mode and journal_mode are left alone:
+        # a :memory: database has no file to fsync or lock, and always journals in memory.
+        for pragma in ("temp_store=MEMORY", "cache_size=-64000"):
+            dbapi_connection.execute(f"PRAGMA {pragma}")
+
+    @event.listens_for(engine, "begin")
+    def emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    # Fresh in-memory database: skip the per-table existence checks
+    Base.metadata.create_all(bind=engine, checkfirst=False)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(db_engine):
+    """Roll back everything the test did, including commits, by running it inside an outer transaction."""
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    # Commits inside the test release a SAVEPOINT instead of ending the outer transaction
+    TestingSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=connection, join_transaction_mode="create_savepoint"
+    )
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
+async def app_client(nats_subject_prefix):
+    """
+    One in-process ASGI client for the whole run; requests go straight to the app on the test's event loop.
+    ASGITransport doesn't send lifespan events, so the startup and shutdown handlers are run here, once.
+    """
+    # Imported here rather than at module level: the API modules call setup_tracing on import,
+    # which must happen after the no-op tracer provider above is installed
+    from httpx import ASGITransport, AsyncClient
+
+    from syntropism.api.service import app
+
+    # The NATS handlers read their subject prefix at startup; keep this worker's handlers in its namespace
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("NATS_SUBJECT_PREFIX", nats_subject_prefix)
+        await app.router.startup()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+    await app.router.shutdown()
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def client(app_client, session):
+    """The shared API client, with requests routed to this test's rollback-isolated session."""
+    from syntropism.api.dependencies import get_db
+    from syntropism.api.service import app
+
+    def override_get_db():
+        yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield app_client
+    del app.dependency_overrides[get_db]
+
+
+@pytest.fixture
+def isolated_workspaces(tmp_path, monkeypatch):
+    """
+    Create this test's agent workspaces under its temp directory instead of ./workspaces, so parallel
+    workers don't share directories and runs leave nothing behind in the checkout. The override is undone
+    after the test, so later tests (e.g. the e2e genesis seeding) see the real ./workspaces again.
+    """
+    root = tmp_path / "workspaces"
+    root.mkdir()
+    monkeypatch.setenv("WORKSPACE_ROOT", str(root))
+    return root
 
 
 def is_service_ready(host="localhost", port=4222):
@@ -14,6 +141,36 @@ def is_service_ready(host="localhost", port=4222):
         return False
 
 
+def wait_for_service(port, timeout=10.0):
+    """Poll a port with exponential backoff (50ms doubling, capped at 500ms) until it accepts connections."""
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while time.monotonic() < deadline:
+        if is_service_ready(port=port):
+            return True
+        time.sleep(min(0.5, 0.05 * 2**attempt))
+        attempt += 1
+    return is_service_ready(port=port)
+
+
+def ensure_compose_services(*services, port, timeout=10.0):
+    """
+    Start docker-compose services unless something is already listening on `port`,
+    then wait for the port to come up. Returns whether the service is ready.
+    """
+    if is_service_ready(port=port):
+        return True
+
+    print(f"\nStarting {', '.join(services)} via docker-compose...")
+    try:
+        subprocess.run(["docker", "compose", "up", "-d", *services], check=True, capture_output=True)
+    except (FileNotFoundError, subprocess.CalledProcessError) as e:
+        print(f"Could not start {', '.join(services)}: {e}")
+        return False
+
+    return wait_for_service(port, timeout=timeout)
+
+
 @pytest.fixture(scope="session")
 def nats_server():
     """
@@ -22,56 +179,39 @@ def nats_server():
     """
     nats_url = "nats://localhost:4222"
 
-    # Check if NATS is already running
-    if not is_service_ready(port=4222):
-        print("\nStarting NATS via docker-compose...")
-        subprocess.run(
-            ["docker", "compose", "up", "-d", "nats"],
-            check=True,
-            capture_output=True,
-        )
-
-        # Wait for NATS to be ready
-        max_retries = 10
-        ready = False
-        for i in range(max_retries):
-            if is_service_ready(port=4222):
-                ready = True
-                break
-            print(f"Waiting for NATS... (attempt {i + 1}/{max_retries})")
-            time.sleep(1)
-
-        if not ready:
-            pytest.fail("NATS failed to start within the timeout period.")
+    if not ensure_compose_services("nats", port=4222):
+        pytest.fail("NATS failed to start within the timeout period.")
 
     yield nats_url
 
 
+@pytest.fixture(scope="session")
+async def nats_client(nats_server):
+    """
+    One client connection reused by every test that talks to NATS.
+    Tests must unsubscribe anything they subscribe; the connection is drained at session end.
+    """
+    nc = await nats.connect(nats_server)
+    yield nc
+    await nc.drain()
+
+
+@pytest.fixture(scope="session")
+def nats_subject_prefix():
+    """
+    Per-worker subject namespace, so xdist workers sharing one NATS server don't answer each other's requests.
+    Pass it to run_nats(subject_prefix=...) and prepend it to the subjects the test publishes on.
+    """
+    return f"{os.environ.get('PYTEST_XDIST_WORKER', 'main')}."
+
+
 @pytest.fixture(scope="session", autouse=True)
 def otel_collector():
     """
     Fixture to ensure OTel Collector and Phoenix are running.
     """
-    # Check if OTel Collector is already running (default port 4317)
-    if not is_service_ready(port=4317):
-        print("\nStarting OTel Collector and Phoenix via docker-compose...")
-        subprocess.run(
-            ["docker", "compose", "up", "-d", "otel-collector", "phoenix"],
-            check=True,
-            capture_output=True,
-        )
-
-        # Wait for Collector to be ready
-        max_retries = 10
-        ready = False
-        for i in range(max_retries):
-            if is_service_ready(port=4317):
-                ready = True
-                break
-            print(f"Waiting for OTel Collector... (attempt {i + 1}/{max_retries})")
-            time.sleep(1)
-
-        if not ready:
-            print("Warning: OTel Collector failed to start. Tests may be slow due to timeouts.")
+    # OTel Collector listens on 4317 (OTLP gRPC)
+    if not ensure_compose_services("otel-collector", "phoenix", port=4317):
+        print("Warning: OTel Collector failed to start. Tests may be slow due to timeouts.")
 
     yield
@@ -1,39 +1,64 @@
+import importlib.util
 import os
 import threading
 import time
 
 import pytest
 import uvicorn
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.pool import StaticPool
 
 from syntropism.cli import bootstrap_genesis_execution, seed_genesis_agent, seed_market_state
 from syntropism.core.orchestrator import run_system_loop
-from syntropism.domain.models import Agent, AgentStatus, Bid, BidStatus
-from syntropism.infra.database import Base, SessionLocal, engine
+from syntropism.domain.attention import AttentionManager
+from syntropism.domain.models import Agent, AgentStatus, Bid, BidStatus, Prompt, PromptStatus, ResourceBundle
+from syntropism.infra.database import Base, SessionLocal
 
 
 @pytest.fixture(scope="module")
 def server_port():
-    return 8000
+    """API port for this xdist worker (8000 on gw0 or without xdist, 8001 on gw1, ...), so servers don't clash."""
+    return 8000 + int(os.environ.get("PYTEST_XDIST_WORKER", "gw0").removeprefix("gw"))
 
 
 @pytest.fixture(scope="module")
-def db_path():
-    return "test_e2e.db"
+def agent_subjects(nats_subject_prefix):
+    """
+    Sandboxed agents reach the system only over NATS. NATS_SUBJECT_PREFIX namespaces both the server's handlers
+    (read at startup) and the agents' requests (forwarded into the container), so workers don't answer each other.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("NATS_SUBJECT_PREFIX", nats_subject_prefix)
+        yield nats_subject_prefix
 
 
 @pytest.fixture(scope="module")
-def server(db_path, server_port):
-    if os.path.exists(db_path):
-        try:
-            os.remove(db_path)
-        except PermissionError:
-            pass
+def db_engine():
+    """
+    In-memory database shared by the tests and the API server thread.
+    SessionLocal is rebound to it, so every component using the shared factory sees the same data.
+    Module-scoped so SessionLocal is restored, and the server stopped, before other suites run.
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    original_bind = SessionLocal.kw["bind"]
+    SessionLocal.configure(bind=engine)
+    yield engine
+    SessionLocal.configure(bind=original_bind)
+    engine.dispose()
 
-    os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite:///{db_path}"
 
+@pytest.fixture(scope="module")
+def server(db_engine, server_port, agent_subjects):
+    """
+    Real uvicorn server on a TCP port for the whole module. Its startup registers the NATS handlers that the
+    sandboxed agents' requests reach, and they keep serving between tests on the server's own event loop.
+    """
     from syntropism.api.service import app
 
-    config = uvicorn.Config(app, host="0.0.0.0", port=server_port, log_level="error")
+    # uvloop/httptools when installed (uvicorn[standard]); they are unavailable on Windows, so fall back
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    config = uvicorn.Config(app, host="0.0.0.0", port=server_port, log_level="error", loop=loop, http=http)
     server = uvicorn.Server(config)
 
     def run_server():
@@ -42,8 +67,12 @@ def server(db_path, server_port):
     thread = threading.Thread(target=run_server, daemon=True)
     thread.start()
 
-    # Wait for server to be ready
-    time.sleep(2)
+    # Wait for uvicorn to bind; started flips once the socket is listening
+    deadline = time.monotonic() + 5
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            pytest.fail("uvicorn failed to start within 5 seconds")
+        time.sleep(0.01)
 
     yield
 
@@ -51,18 +80,39 @@ def server(db_path, server_port):
     server.should_exit = True
     thread.join(timeout=5)
 
-    if os.path.exists(db_path):
-        try:
-            os.remove(db_path)
-        except PermissionError:
-            pass
+
+@pytest.fixture(scope="module")
+def seed_bundles(db_engine):
+    """Canonical resource bundles, created once for the module; returns their ids by key."""
+    # Fresh in-memory database: skip the per-table existence checks
+    Base.metadata.create_all(bind=db_engine, checkfirst=False)
+    bundles = {
+        "default": ResourceBundle(cpu_percent=0.1, memory_percent=0.1, tokens_percent=0.1, duration_seconds=5.0),
+        "attention": ResourceBundle(
+            cpu_percent=0.1, memory_percent=0.1, tokens_percent=0.1, attention_percent=1.0, duration_seconds=5.0
+        ),
+    }
+    with SessionLocal() as session:
+        session.add_all(bundles.values())
+        session.commit()
+        return {key: bundle.id for key, bundle in bundles.items()}
+
+
+@pytest.fixture(scope="session")
+def workspace_root(tmp_path_factory):
+    """Workspace directories for agents created by the tests, kept out of the repo checkout."""
+    return tmp_path_factory.mktemp("workspaces")
 
 
 @pytest.fixture
-def db_session(server, db_path):
-    # Clear the database for each test
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+def db_session(server, db_engine, seed_bundles):
+    # Clear everything but the seeded bundles for each test
+    with db_engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            stmt = table.delete()
+            if table is ResourceBundle.__table__:
+                stmt = stmt.where(table.c.id.not_in(seed_bundles.values()))
+            conn.execute(stmt)
 
     session = SessionLocal()
     seed_market_state(session)
@@ -72,7 +122,7 @@ def db_session(server, db_path):
 
 @pytest.mark.asyncio
 @pytest.mark.e2e
-async def test_survival_loop(db_session, monkeypatch):
+async def test_survival_loop(db_session):
     # 1. Setup Genesis
     agent = seed_genesis_agent(db_session)
     assert agent.id == "genesis"
@@ -80,126 +130,112 @@ async def test_survival_loop(db_session, monkeypatch):
     # 2. Run loop 1 (Bootstrap + Execution)
     bootstrap_genesis_execution(db_session)
 
-    # Mock input() for the prompt triggered by bootstrap
-    monkeypatch.setattr("builtins.input", lambda _: "8 9 7")
-
-    db_session.commit()
     await run_system_loop(db_session)
 
     # 3. Verify agent executed once
-    db_session.commit()
-    db_session.refresh(agent)
+    # Filter on the known id: the loop's commit expired `agent`, and touching it would reload the row
     from syntropism.domain.models import Execution
 
-    executions = db_session.query(Execution).filter_by(agent_id=agent.id, status="COMPLETED").count()
+    executions = db_session.scalar(
+        select(func.count()).select_from(Execution).filter_by(agent_id="genesis", status="COMPLETED")
+    )
     assert executions == 1
 
     # 4. Verify agent placed a new PENDING bid during execution
-    new_bid = db_session.query(Bid).filter_by(from_agent_id=agent.id, status=BidStatus.PENDING).first()
+    new_bid = db_session.scalar(select(Bid).filter_by(from_agent_id="genesis", status=BidStatus.PENDING).limit(1))
     assert new_bid is not None
 
     # 5. Run loop 2 (Allocation + Execution of new bid)
-    db_session.commit()
     await run_system_loop(db_session)
-    db_session.commit()
-    db_session.refresh(agent)
-    executions = db_session.query(Execution).filter_by(agent_id=agent.id, status="COMPLETED").count()
+    executions = db_session.scalar(
+        select(func.count()).select_from(Execution).filter_by(agent_id="genesis", status="COMPLETED")
+    )
     assert executions == 2
 
 
 @pytest.mark.asyncio
 @pytest.mark.e2e
-async def test_human_interaction(db_session, monkeypatch):
+async def test_human_interaction(db_session, seed_bundles):
     # 1. Setup agent with attention allocation
     agent = seed_genesis_agent(db_session)
 
     # 2. Bootstrap with attention_percent=1.0
-    from syntropism.domain.models import Bid, BidStatus, Execution, ResourceBundle
+    from syntropism.domain.models import Bid, BidStatus, Execution
 
-    bundle = ResourceBundle(
-        cpu_percent=0.1, memory_percent=0.1, tokens_percent=0.1, attention_percent=1.0, duration_seconds=5.0
+    # Linked through the relationship so the unit of work inserts both in one flush
+    execution = Execution(
+        agent_id=agent.id,
+        resource_bundle_id=seed_bundles["attention"],
+        status="PENDING",
     )
-    db_session.add(bundle)
-    db_session.flush()
-
     bid = Bid(
         from_agent_id=agent.id,
-        resource_bundle_id=bundle.id,
+        resource_bundle_id=seed_bundles["attention"],
         amount=10.0,
         status=BidStatus.WINNING,
+        execution=execution,
     )
-    db_session.add(bid)
-
-    execution = Execution(
-        agent_id=agent.id,
-        resource_bundle_id=bundle.id,
-        status="PENDING",
-    )
-    db_session.add(execution)
-    db_session.flush()
-    bid.execution_id = execution.id
+    db_session.add_all([execution, bid])
     agent.credit_balance -= 10.0
     db_session.commit()
 
-    # 3. Mock input() for human scores
-    monkeypatch.setattr("builtins.input", lambda _: "8 9 7")
-
-    # 4. Run loop
+    # 3. Run loop
     initial_balance = agent.credit_balance
     await run_system_loop(db_session)
 
-    # 5. Verify credits awarded
+    # 4. Loop shows the agent's prompt without blocking on scores; with no NATS connection it stays queued
+    prompt = db_session.scalar(select(Prompt).filter_by(from_agent_id=agent.id).limit(1))
+    assert prompt is not None
+    assert prompt.status == PromptStatus.PENDING
+
+    # 5. Human scores the prompt out-of-band
+    AttentionManager.reward_prompt(db_session, prompt.id, interesting=8.0, useful=9.0, understandable=7.0)
+    db_session.flush()
+
+    # 6. Verify credits awarded
     db_session.refresh(agent)
     assert agent.credit_balance > initial_balance
 
 
 @pytest.mark.asyncio
 @pytest.mark.e2e
-async def test_agent_spawning(db_session, monkeypatch):
+async def test_agent_spawning(db_session, seed_bundles):
     # 1. Setup Genesis
     seed_genesis_agent(db_session)
 
     # 2. Bootstrap
     bootstrap_genesis_execution(db_session)
 
-    # 3. Mock input() for human scores
-    monkeypatch.setattr("builtins.input", lambda _: "8 9 7")
-
-    # 4. Run loop
+    # 3. Run loop
     await run_system_loop(db_session)
 
-    # 5. Verify child agent created
-    child = db_session.query(Agent).filter(Agent.id != "genesis").first()
+    # 4. Verify child agent created
+    child = db_session.scalar(select(Agent).where(Agent.id != "genesis").limit(1))
     assert child is not None
+    child_id = child.id
     assert child.spawn_lineage == ["genesis"]
 
-    # 6. Verify child has a workspace
+    # 5. Verify child has a workspace
     assert child.workspace_id is not None
 
-    # 7. Run loop again to execute child
+    # 6. Run loop again to execute child
     # Child needs a bid to be executed
-    from syntropism.domain.models import Bid, BidStatus, Execution, ResourceBundle
-
-    bundle = ResourceBundle(cpu_percent=0.1, memory_percent=0.1, tokens_percent=0.1, duration_seconds=5.0)
-    db_session.add(bundle)
-    db_session.flush()
+    from syntropism.domain.models import Bid, BidStatus, Execution
 
+    # Linked through the relationship so the unit of work inserts both in one flush
+    execution = Execution(
+        agent_id=child.id,
+        resource_bundle_id=seed_bundles["default"],
+        status="PENDING",
+    )
     bid = Bid(
         from_agent_id=child.id,
-        resource_bundle_id=bundle.id,
+        resource_bundle_id=seed_bundles["default"],
         amount=10.0,
         status=BidStatus.WINNING,
+        execution=execution,
     )
-    db_session.add(bid)
-
-    execution = Execution(
-        agent_id=child.id,
-        resource_bundle_id=bundle.id,
-        status="PENDING",
-    )
-    db_session.add(execution)
-    db_session.flush()
-    bid.execution_id = execution.id
+    db_session.add_all([execution, bid])
     child.credit_balance -= 10.0
     db_session.commit()
 
@@ -207,88 +243,62 @@ async def test_agent_spawning(db_session, monkeypatch):
     await run_system_loop(db_session)
 
     # Verify child executed
-    db_session.commit()
-    db_session.refresh(child)
-    executions = db_session.query(Execution).filter_by(agent_id=child.id, status="COMPLETED").count()
+    executions = db_session.scalar(
+        select(func.count()).select_from(Execution).filter_by(agent_id=child_id, status="COMPLETED")
+    )
     assert executions == 1
 
 
 @pytest.mark.asyncio
 @pytest.mark.e2e
-async def test_bid_competition(db_session):
-    # 1. Setup two agents
-    from syntropism.core.genesis import _create_agent_with_workspace
-
-    workspace_root = os.path.join(os.getcwd(), "workspaces")
-    a1 = _create_agent_with_workspace(db_session, 100.0, [], os.path.join(workspace_root, "a1"), "agent1")
-    a2 = _create_agent_with_workspace(db_session, 100.0, [], os.path.join(workspace_root, "a2"), "agent2")
-    db_session.commit()
+async def test_bid_competition(db_session, seed_bundles):
+    # 1. Setup two agents; neither executes, so plain rows without workspaces are enough
+    db_session.execute(
+        insert(Agent), [{"id": "agent1", "credit_balance": 100.0}, {"id": "agent2", "credit_balance": 100.0}]
+    )
 
     # 2. Place bids for same limited resource (e.g. Attention)
     from syntropism.core.scheduler import AllocationScheduler
-    from syntropism.domain.models import Bid, BidStatus, ResourceBundle
-
-    # A1 bids 10 for attention
-    b1_bundle = ResourceBundle(
-        cpu_percent=0.1, memory_percent=0.1, tokens_percent=0.1, attention_percent=1.0, duration_seconds=5.0
-    )
-    db_session.add(b1_bundle)
-    db_session.flush()
-    await AllocationScheduler.place_bid(db_session, a1.id, b1_bundle.id, 10.0)
+    from syntropism.domain.models import Bid, BidStatus
 
-    # A2 bids 20 for attention
-    b2_bundle = ResourceBundle(
-        cpu_percent=0.1, memory_percent=0.1, tokens_percent=0.1, attention_percent=1.0, duration_seconds=5.0
-    )
-    db_session.add(b2_bundle)
-    db_session.flush()
-    await AllocationScheduler.place_bid(db_session, a2.id, b2_bundle.id, 20.0)
-
-    db_session.commit()
+    # Both bid for the same attention bundle; A1 bids 10, A2 bids 20
+    await AllocationScheduler.place_bid(db_session, "agent1", seed_bundles["attention"], 10.0)
+    await AllocationScheduler.place_bid(db_session, "agent2", seed_bundles["attention"], 20.0)
 
     # 3. Run allocation
     await AllocationScheduler.run_allocation_cycle(db_session)
-    db_session.commit()
 
     # 4. Verify A2 wins, A1 outbid
-    bid1 = db_session.query(Bid).filter_by(from_agent_id=a1.id).first()
-    bid2 = db_session.query(Bid).filter_by(from_agent_id=a2.id).first()
+    bids = {
+        b.from_agent_id: b for b in db_session.scalars(select(Bid).where(Bid.from_agent_id.in_(["agent1", "agent2"])))
+    }
 
-    assert bid2.status == BidStatus.WINNING
-    assert bid1.status == BidStatus.OUTBID
+    assert bids["agent2"].status == BidStatus.WINNING
+    assert bids["agent1"].status == BidStatus.OUTBID
 
 
 @pytest.mark.asyncio
 @pytest.mark.e2e
-async def test_agent_death(db_session):
+async def test_agent_death(db_session, seed_bundles, workspace_root):
     # 1. Setup agent with 1 credit
     from syntropism.core.genesis import _create_agent_with_workspace
 
-    workspace_root = os.path.join(os.getcwd(), "workspaces")
-    agent = _create_agent_with_workspace(db_session, 1.0, [], os.path.join(workspace_root, "poor_agent"), "poor_agent")
-    db_session.commit()
+    agent = _create_agent_with_workspace(db_session, 1.0, [], str(workspace_root / "poor_agent"), "poor_agent")
 
     # 2. Place bid for 1 credit
     from syntropism.core.scheduler import AllocationScheduler
-    from syntropism.domain.models import BidStatus, Execution, ResourceBundle
-
-    bundle = ResourceBundle(cpu_percent=0.1, memory_percent=0.1, tokens_percent=0.1, duration_seconds=5.0)
-    db_session.add(bundle)
-    db_session.flush()
+    from syntropism.domain.models import BidStatus, Execution
 
     # Use place_bid to ensure it's recorded correctly
-    bid = await AllocationScheduler.place_bid(db_session, agent.id, bundle.id, 1.0)
+    bid = await AllocationScheduler.place_bid(db_session, agent.id, seed_bundles["default"], 1.0)
 
     # Manually mark as WINNING and create execution for the loop to process it
     bid.status = BidStatus.WINNING
-    execution = Execution(
+    bid.execution = Execution(
         agent_id=agent.id,
-        resource_bundle_id=bundle.id,
+        resource_bundle_id=seed_bundles["default"],
         status="PENDING",
     )
-    db_session.add(execution)
-    db_session.flush()
-    bid.execution_id = execution.id
 
     # Spend the credit
     agent.credit_balance -= 1.0
@@ -298,7 +308,6 @@ async def test_agent_death(db_session):
     await run_system_loop(db_session)
 
     # 4. Verify status is DEAD
-    db_session.commit()
     db_session.refresh(agent)
     assert agent.credit_balance <= 0
     assert agent.status == AgentStatus.DEAD
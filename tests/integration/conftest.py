@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import raiseload
+from sqlalchemy.pool import StaticPool
+
+from syntropism.benchmarks.constructor import BenchmarkConstructor
+from syntropism.benchmarks.runner import BenchmarkRunner
+from syntropism.domain.models import Bid, Execution, Prompt
+from syntropism.infra.database import Base, SessionLocal
+from syntropism.infra.mcp_gateway import MCPGateway
+
+
+@pytest.fixture
+def strict_loading(session):
+    """
+    Make any lazy load from a Bid, Execution or Prompt query raise, so a missing eager load fails the test
+    instead of quietly issuing one SELECT per row.
+    """
+    strict_classes = {Bid, Execution, Prompt}
+
+    def add_raiseload(orm_execute_state):
+        if orm_execute_state.is_select and any(m.class_ in strict_classes for m in orm_execute_state.all_mappers):
+            orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+    event.listen(session, "do_orm_execute", add_raiseload)
+    yield session
+    event.remove(session, "do_orm_execute", add_raiseload)
+
+
+@pytest.fixture(scope="module")
+def isolated_database():
+    """
+    Rebind SessionLocal to a private in-memory database for the module, so NATS handlers opening their own
+    sessions don't share ./database.db with other workers (or drop its tables under them on teardown).
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, checkfirst=False)
+    original_bind = SessionLocal.kw["bind"]
+    SessionLocal.configure(bind=engine)
+    yield engine
+    SessionLocal.configure(bind=original_bind)
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def benchmark_constructor():
+    return BenchmarkConstructor()
+
+
+@pytest.fixture(scope="session")
+def benchmark_scenarios(benchmark_constructor):
+    """Scenario catalogue, parsed once and shared by every integration test that needs it."""
+    return benchmark_constructor.load_all()
+
+
+class MockSandbox:
+    """Stands in for ExecutionSandbox: every agent run exits cleanly without touching Docker."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def run_agent(self, *args, **kwargs):
+        return 0, "Benchmark agent executed successfully."
+
+
+class MockBenchmarkRunner:
+    """Stands in for BenchmarkRunner: every scenario passes without running the market."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run_scenario(self, scenario_path, agent_id):
+        return {"scenario_id": "fc001", "agent_id": agent_id, "success": True}
+
+
+@pytest.fixture
+def mock_sandbox(monkeypatch):
+    monkeypatch.setattr("syntropism.core.orchestrator.ExecutionSandbox", MockSandbox)
+    return MockSandbox
+
+
+@pytest.fixture
+def mock_benchmark_runner(monkeypatch):
+    monkeypatch.setattr("syntropism.benchmarks.runner.BenchmarkRunner", MockBenchmarkRunner)
+    return MockBenchmarkRunner
+
+
+@pytest.fixture
+async def benchmark_runner(nats_server, nats_subject_prefix):
+    """A BenchmarkRunner collecting this worker's system events; closed even when the test fails."""
+    runner = BenchmarkRunner(nats_url=nats_server, subject_prefix=nats_subject_prefix)
+    await runner.connect()
+    await runner.start_collecting()
+    yield runner
+    await runner.close()
+
+
+@pytest.fixture
+async def mcp_gateway(nats_server, nats_subject_prefix):
+    """An MCPGateway consuming this worker's stream in the background until the test ends."""
+    gateway = MCPGateway(nats_url=nats_server, subject_prefix=nats_subject_prefix)
+    await gateway.connect()
+    await gateway.setup_stream()
+    task = asyncio.create_task(gateway.run())
+    yield gateway
+    task.cancel()
+    # Collects the CancelledError instead of raising it
+    await asyncio.gather(task, return_exceptions=True)
+    await gateway.close()
@@ -6,44 +6,17 @@ It mocks the ExecutionSandbox to simulate agent execution and verifies the datab
 """
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import Session
 
 from syntropism.core.genesis import create_genesis_agent
 from syntropism.core.scheduler import AllocationScheduler
 from syntropism.domain.attention import AttentionManager
 from syntropism.domain.models import Execution, PromptStatus, ResourceBundle
-from syntropism.infra.database import Base
-
-
-@pytest.fixture
-def db_engine():
-    """Create an in-memory SQLite database."""
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    Base.metadata.create_all(bind=engine)
-    yield engine
-    Base.metadata.drop_all(bind=engine)
-
-
-@pytest.fixture
-def session(db_engine):
-    """Create a new database session."""
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
-    session = TestingSessionLocal()
-    try:
-        yield session
-    finally:
-        session.close()
 
 
 @pytest.mark.asyncio
 @pytest.mark.integration
-async def test_full_attention_flow(session: Session):
+async def test_full_attention_flow(session: Session, strict_loading):
     """
     Test the full lifecycle: Bootstrap -> Bid -> Execution -> Prompt -> Reward.
     """
@@ -64,12 +37,11 @@ async def test_full_attention_flow(session: Session):
 
     # Run allocation cycle (manual trigger)
     await AllocationScheduler.run_allocation_cycle(session)
-    session.refresh(bid)
 
     assert bid.status.value == "winning", "Bid should be winning"
     assert bid.execution_id is not None, "Bid should have execution ID"
 
-    execution = session.query(Execution).filter(Execution.id == bid.execution_id).first()
+    execution = session.get(Execution, bid.execution_id)
     assert execution is not None
 
     # 2. Simulate Agent Execution (Mock Sandbox)
@@ -108,14 +80,13 @@ async def test_full_attention_flow(session: Session):
         reason="The agent demonstrated clear understanding.",
     )
 
-    session.commit()  # Ensure the state is committed to the DB session
+    # The prompt and agent updated by reward_prompt are the identity-mapped objects asserted on below
+    session.flush()
 
     assert response.credits_awarded > 0
-    session.refresh(prompt)
     assert prompt.status == PromptStatus.RESPONDED
 
     # Verify agent received credits
-    session.refresh(agent)
     assert agent.total_credits_earned > 0
 
     print(f"Agent {agent.id} earned {response.credits_awarded} credits.")
@@ -1,40 +1,21 @@
-import asyncio
-
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
-from syntropism.benchmarks.runner import BenchmarkRunner
 from syntropism.core.scheduler import AllocationScheduler
 from syntropism.domain.economy import EconomicEngine
 from syntropism.domain.market import ResourceType
 from syntropism.domain.models import Agent, MarketState, ResourceBundle
-from syntropism.infra.database import Base
-
-
-@pytest.fixture
-def session():
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    yield session
-    session.close()
-    engine.dispose()
 
 
 @pytest.mark.asyncio
-async def test_full_market_cycle_benchmark(session):
+async def test_full_market_cycle_benchmark(session, nats_subject_prefix, benchmark_runner):
     """
     Verify that a full market cycle (Bid -> Allocate -> Burn -> Discover Price)
     passes the benchmark validation.
     """
     # We need a real NATS for this or a very good mock.
     # Since the environment has NATS, let's try to use it.
-    runner = BenchmarkRunner()
-    await runner.connect()
-    await runner.start_collecting()
-
+    # The runner is namespaced per xdist worker, so events from other workers are neither counted nor validated
+    runner = benchmark_runner
     nc = runner.nc  # Use the same connection
 
     # Setup market
@@ -49,14 +30,16 @@ async def test_full_market_cycle_benchmark(session):
     session.commit()
 
     # 1. Bid & Allocate
-    await AllocationScheduler.place_bid(session, agent.id, bundle.id, 50.0, nc=nc)
-    await AllocationScheduler.run_allocation_cycle(session, nc=nc)
+    await AllocationScheduler.place_bid(session, agent.id, bundle.id, 50.0, nc=nc, subject_prefix=nats_subject_prefix)
+    await AllocationScheduler.run_allocation_cycle(session, nc=nc, subject_prefix=nats_subject_prefix)
 
     # 2. Burn (Simulate resource payment)
-    await EconomicEngine.transfer_credits(session, agent.id, "system", 50.0, "resource_payment", nc=nc)
+    await EconomicEngine.transfer_credits(
+        session, agent.id, "system", 50.0, "resource_payment", nc=nc, subject_prefix=nats_subject_prefix
+    )
 
-    # Wait for events to be collected
-    await asyncio.sleep(0.5)
+    # Wait for BidPlaced, BidProcessed, PriceDiscovered and CreditsBurned to be collected
+    await runner.wait_for_events(4)
 
     scenario = {
         "task_id": "er_001",
@@ -71,5 +54,3 @@ async def test_full_market_cycle_benchmark(session):
     }
 
     assert runner.validate_scenario(scenario) is True
-
-    await runner.close()
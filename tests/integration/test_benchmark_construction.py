@@ -1,23 +1,17 @@
 import pytest
 
-from syntropism.benchmarks.constructor import BenchmarkConstructor
-
-
-def test_benchmark_constructor_loads_and_validates_all():
-    constructor = BenchmarkConstructor()
-    scenarios = constructor.load_all()
 
+def test_benchmark_constructor_loads_and_validates_all(benchmark_constructor, benchmark_scenarios):
     # We expect 25 scenarios (5 FC + 15 ER + 5 SI)
     # But let's be flexible in case there are more or some failed to load
-    assert len(scenarios) >= 25
+    assert len(benchmark_scenarios) >= 25
 
-    for s in scenarios:
+    for s in benchmark_scenarios:
         print(f"Validating scenario: {s.id} ({s.domain})")
-        constructor.validate_scenario(s)
+        benchmark_constructor.validate_scenario(s)
 
 
-def test_benchmark_constructor_invalid_event_type():
-    constructor = BenchmarkConstructor()
+def test_benchmark_constructor_invalid_event_type(benchmark_constructor):
     from syntropism.benchmarks.constructor import BenchmarkScenario, BenchmarkValidation
 
     invalid_scenario = BenchmarkScenario(
@@ -31,4 +25,4 @@ def test_benchmark_constructor_invalid_event_type():
     )
 
     with pytest.raises(ValueError, match="Invalid event type in required_events: non_existent_event"):
-        constructor.validate_scenario(invalid_scenario)
+        benchmark_constructor.validate_scenario(invalid_scenario)
@@ -1,24 +1,18 @@
-import json
-
-import nats
+import orjson
 import pytest
+from sqlalchemy.dialects.sqlite import insert
 
 from syntropism.domain.economy import EconomicEngine
 from syntropism.domain.market import MarketManager, ResourceType
 from syntropism.domain.models import Agent, MarketState
 from syntropism.domain.social import SocialManager
-from syntropism.infra.database import Base, SessionLocal, engine
-
+from syntropism.infra.database import SessionLocal
 
-@pytest.fixture(scope="module", autouse=True)
-def setup_database():
-    Base.metadata.create_all(bind=engine)
-    yield
-    Base.metadata.drop_all(bind=engine)
+pytestmark = pytest.mark.usefixtures("isolated_database")
 
 
 @pytest.mark.asyncio
-async def test_economic_balance_nats(nats_server):
+async def test_economic_balance_nats(nats_server, nats_client, nats_subject_prefix):
     # Setup: Create an agent in the DB
     agent_id = "agent_1"
     with SessionLocal() as session:
@@ -29,23 +23,19 @@ async def test_economic_balance_nats(nats_server):
 
     # Start NATS handler
     engine_instance = EconomicEngine()
-    handler_nc = await engine_instance.run_nats(nats_url=nats_server)
-
-    # Client connection
-    nc = await nats.connect(nats_server)
+    handler_nc = await engine_instance.run_nats(nats_url=nats_server, subject_prefix=nats_subject_prefix)
 
     try:
-        response = await nc.request(f"economic.balance.{agent_id}", b"", timeout=2)
-        data = json.loads(response.data)
+        response = await nats_client.request(f"{nats_subject_prefix}economic.balance.{agent_id}", b"", timeout=2)
+        data = orjson.loads(response.data)
         assert data["agent_id"] == agent_id
         assert data["balance"] == 1000.0
     finally:
-        await nc.close()
         await handler_nc.close()
 
 
 @pytest.mark.asyncio
-async def test_market_state_nats(nats_server):
+async def test_market_state_nats(nats_server, nats_client, nats_subject_prefix):
     # Setup: Create market state in the DB
     with SessionLocal() as session:
         state = session.query(MarketState).filter_by(resource_type=ResourceType.CPU.value).first()
@@ -59,46 +49,38 @@ async def test_market_state_nats(nats_server):
 
     # Start NATS handler
     manager_instance = MarketManager()
-    handler_nc = await manager_instance.run_nats(nats_url=nats_server)
-
-    # Client connection
-    nc = await nats.connect(nats_server)
+    handler_nc = await manager_instance.run_nats(nats_url=nats_server, subject_prefix=nats_subject_prefix)
 
     try:
-        response = await nc.request(f"market.state.{ResourceType.CPU.value}", b"", timeout=2)
-        data = json.loads(response.data)
+        response = await nats_client.request(
+            f"{nats_subject_prefix}market.state.{ResourceType.CPU.value}", b"", timeout=2
+        )
+        data = orjson.loads(response.data)
         assert data["resource_type"] == ResourceType.CPU.value
         assert data["price"] == 1.5
     finally:
-        await nc.close()
         await handler_nc.close()
 
 
 @pytest.mark.asyncio
-async def test_social_message_nats(nats_server):
+async def test_social_message_nats(nats_server, nats_client, nats_subject_prefix):
     # Setup: Create agents in the DB
     agent_1 = "agent_1"
     agent_2 = "agent_2"
     with SessionLocal() as session:
-        if not session.query(Agent).filter_by(id=agent_1).first():
-            session.add(Agent(id=agent_1))
-        if not session.query(Agent).filter_by(id=agent_2).first():
-            session.add(Agent(id=agent_2))
+        # One multi-row INSERT; agent_1 may already exist from the balance test
+        session.execute(insert(Agent).on_conflict_do_nothing(), [{"id": agent_1}, {"id": agent_2}])
         session.commit()
 
     # Start NATS handler
     social_instance = SocialManager()
-    handler_nc = await social_instance.run_nats(nats_url=nats_server)
-
-    # Client connection
-    nc = await nats.connect(nats_server)
+    handler_nc = await social_instance.run_nats(nats_url=nats_server, subject_prefix=nats_subject_prefix)
 
     try:
         payload = {"from_id": agent_1, "to_id": agent_2, "content": "Hello from NATS!"}
-        response = await nc.request("social.message", json.dumps(payload).encode(), timeout=2)
-        data = json.loads(response.data)
+        response = await nats_client.request(f"{nats_subject_prefix}social.message", orjson.dumps(payload), timeout=2)
+        data = orjson.loads(response.data)
         assert data["status"] == "success"
         assert "message_id" in data
     finally:
-        await nc.close()
         await handler_nc.close()
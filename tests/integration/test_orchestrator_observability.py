@@ -7,6 +7,49 @@ from syntropism.core.orchestrator import run_system_loop
 from syntropism.domain.models import Agent, Bid, BidStatus, ResourceBundle, Workspace
 
 
+class _StubQuery:
+    """The slice of the Query API run_system_loop uses; every filter returns the same preset rows."""
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def options(self, *args):
+        return self
+
+    def filter_by(self, **kwargs):
+        return self
+
+    def filter(self, *args):
+        return self
+
+    def all(self):
+        return list(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class _StubResult:
+    def scalars(self):
+        return []
+
+
+class StubSession:
+    """Plain stand-in for a Session: query(Model) returns preset rows, bulk statements affect nothing."""
+
+    def __init__(self, rows_by_model):
+        self._rows_by_model = rows_by_model
+
+    def query(self, model):
+        return _StubQuery(self._rows_by_model.get(model, []))
+
+    def execute(self, statement):
+        return _StubResult()
+
+    def commit(self):
+        pass
+
+
 @pytest.mark.asyncio
 async def test_orchestrator_agent_span():
     """Test that run_system_loop creates an AGENT span for execution."""
@@ -14,9 +57,6 @@ async def test_orchestrator_agent_span():
     mock_tracer = MagicMock()
     mock_tracer.start_as_current_span.return_value.__enter__.return_value = mock_span
 
-    # Mock session
-    mock_session = MagicMock()
-
     # Mock agent and bid
     agent = Agent(id="test_agent_span")
     bundle = ResourceBundle(id="bundle_1", cpu_percent=10.0, memory_percent=10.0, attention_percent=10.0)
@@ -31,8 +71,7 @@ async def test_orchestrator_agent_span():
     )
     workspace = Workspace(agent_id=agent.id, filesystem_path="/tmp/test_workspace")
 
-    mock_session.query.return_value.filter_by.return_value.all.return_value = [bid]
-    mock_session.query.return_value.filter_by.return_value.first.side_effect = [workspace, None] # workspace, then execution
+    session = StubSession({Bid: [bid], Workspace: [workspace]})
 
     # Mock NATS
     mock_nc = MagicMock()
@@ -46,10 +85,10 @@ async def test_orchestrator_agent_span():
          patch("syntropism.core.orchestrator.AttentionManager.get_pending_prompts", return_value=[]), \
          patch("syntropism.core.orchestrator.ExecutionSandbox") as mock_sandbox_cls, \
          patch("os.path.exists", return_value=False), \
-         patch("builtins.open", MagicMock()):
+         patch("syntropism.core.orchestrator.Path.write_bytes"):
 
         mock_sandbox_cls.return_value.run_agent.return_value = (0, "test logs")
-        await run_system_loop(mock_session, nc=mock_nc)
+        await run_system_loop(session, nc=mock_nc)
 
     # Verify span creation
     mock_tracer.start_as_current_span.assert_any_call("agent_execution")
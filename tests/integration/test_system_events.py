@@ -2,24 +2,10 @@ import json
 from unittest.mock import AsyncMock
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 from syntropism.core.scheduler import AllocationScheduler
 from syntropism.domain.market import ResourceType
 from syntropism.domain.models import Agent, MarketState, ResourceBundle
-from syntropism.infra.database import Base
-
-
-@pytest.fixture
-def session():
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    yield session
-    session.close()
-    engine.dispose()
 
 
 @pytest.mark.asyncio
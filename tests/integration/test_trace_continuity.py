@@ -1,30 +1,22 @@
-import json
-
-import nats
+import orjson
 import pytest
 from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import SimpleSpanProcessor
 from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 
-from syntropism.core.observability import extract_context, inject_context, setup_tracing
+from syntropism.core.observability import extract_context, inject_context
 from syntropism.domain.economy import EconomicEngine
 from syntropism.domain.models import Agent
-from syntropism.infra.database import Base, SessionLocal, engine
-
+from syntropism.infra.database import SessionLocal
 
-@pytest.fixture(scope="module", autouse=True)
-def setup_database():
-    Base.metadata.create_all(bind=engine)
-    yield
-    Base.metadata.drop_all(bind=engine)
+pytestmark = pytest.mark.usefixtures("isolated_database")
 
 
 @pytest.fixture
 def tracer_provider():
     provider = TracerProvider()
-    # We don't set_tracer_provider here because it might already be set by setup_tracing
-    # Instead we use the provider to create a tracer for testing
+    # The global provider is a no-op under test; we use this provider to create a tracer for testing
     return provider
 
 
@@ -36,10 +28,9 @@ def span_exporter(tracer_provider):
 
 
 @pytest.mark.asyncio
-async def test_nats_trace_propagation(nats_server, tracer_provider, span_exporter):
+async def test_nats_trace_propagation(nats_server, nats_client, nats_subject_prefix, tracer_provider, span_exporter):
     """Test that trace context is propagated through NATS headers."""
     tracer = tracer_provider.get_tracer("test-tracer")
-    nc = await nats.connect(nats_server)
 
     received_trace_id = None
     received_parent_span_id = None
@@ -57,7 +48,7 @@ async def test_nats_trace_propagation(nats_server, tracer_provider, span_exporte
 
         await msg.respond(b"ok")
 
-    sub = await nc.subscribe("test.trace.propagation", cb=handler)
+    sub = await nats_client.subscribe(f"{nats_subject_prefix}test.trace.propagation", cb=handler)
 
     try:
         with tracer.start_as_current_span("parent-span") as parent_span:
@@ -67,16 +58,20 @@ async def test_nats_trace_propagation(nats_server, tracer_provider, span_exporte
 
             headers = {}
             inject_context(headers)
-            await nc.request("test.trace.propagation", b"data", headers=headers, timeout=2)
+            await nats_client.request(
+                f"{nats_subject_prefix}test.trace.propagation", b"data", headers=headers, timeout=2
+            )
 
         assert received_trace_id == parent_trace_id
         assert received_parent_span_id == parent_span_id
     finally:
-        await nc.close()
+        await sub.unsubscribe()
 
 
 @pytest.mark.asyncio
-async def test_economic_engine_trace_propagation(nats_server, tracer_provider, span_exporter):
+async def test_economic_engine_trace_propagation(
+    nats_server, nats_client, nats_subject_prefix, tracer_provider, span_exporter
+):
     """Test that EconomicEngine correctly extracts trace context from NATS headers."""
     # Setup: Create an agent in the DB
     agent_id = "trace_agent_1"
@@ -92,24 +87,24 @@ async def test_economic_engine_trace_propagation(nats_server, tracer_provider, s
     # But setup_tracing is called at module level in economy.py
     # For this test, we'll just verify that it extracts headers if present
 
-    handler_nc = await engine_instance.run_nats(nats_url=nats_server)
-    nc = await nats.connect(nats_server)
+    handler_nc = await engine_instance.run_nats(nats_url=nats_server, subject_prefix=nats_subject_prefix)
 
     try:
         # Start a span and inject context
-        tracer = setup_tracing("test-client")
+        tracer = tracer_provider.get_tracer("test-client")
         with tracer.start_as_current_span("client-request") as span:
             trace_id = format(span.get_span_context().trace_id, "032x")
             headers = {}
             inject_context(headers)
 
-            response = await nc.request(f"economic.balance.{agent_id}", b"", headers=headers, timeout=2)
-            data = json.loads(response.data)
+            response = await nats_client.request(
+                f"{nats_subject_prefix}economic.balance.{agent_id}", b"", headers=headers, timeout=2
+            )
+            data = orjson.loads(response.data)
             assert data["agent_id"] == agent_id
 
             # Note: We can't easily verify the span created inside EconomicEngine
             # without mocking its tracer or using a global provider.
             # But we've verified the extraction logic in test_nats_trace_propagation.
     finally:
-        await nc.close()
         await handler_nc.close()
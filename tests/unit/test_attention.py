@@ -1,67 +1,31 @@
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import insert
 
-from syntropism.api.dependencies import get_db
-from syntropism.api.service import app
 from syntropism.domain.attention import AttentionManager
 from syntropism.domain.models import Agent, Execution, Prompt, PromptStatus, ResourceBundle, Response, Transaction
-from syntropism.infra.database import Base
 
 
-@pytest.fixture
-def db_engine():
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
+def seed_execution(session, credit_balance=100.0, execution_ids=("exec-1",)):
+    """Insert agent-1 with an attention-bearing bundle-1 and its executions, one bulk INSERT per table."""
+    session.execute(insert(Agent), [{"id": "agent-1", "credit_balance": credit_balance}])
+    session.execute(insert(ResourceBundle), [{"id": "bundle-1", "attention_share": 0.1}])
+    session.execute(
+        insert(Execution),
+        [{"id": exec_id, "agent_id": "agent-1", "resource_bundle_id": "bundle-1"} for exec_id in execution_ids],
     )
-    Base.metadata.create_all(bind=engine)
-    yield engine
-    Base.metadata.drop_all(bind=engine)
-
-
-@pytest.fixture
-def db_session(db_engine):
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
 
-@pytest.fixture
-def client(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
-
-    app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as c:
-        yield c
-    app.dependency_overrides.clear()
-
-
-def test_submit_prompt(db_session):
-    agent = Agent(id="agent-1", credit_balance=100.0)
-    bundle = ResourceBundle(id="bundle-1", attention_share=0.1)
-    execution = Execution(id="exec-1", agent_id="agent-1", resource_bundle_id="bundle-1")
-    db_session.add_all([agent, bundle, execution])
-    db_session.commit()
+def test_submit_prompt(session):
+    seed_execution(session)
 
     prompt = AttentionManager.submit_prompt(
-        db_session,
+        session,
         agent_id="agent-1",
         execution_id="exec-1",
         content={"question": "What is 2+2?"},
         bid_amount=10.0,
     )
-    db_session.commit()
+    session.flush()
 
     assert prompt.id is not None
     assert prompt.from_agent_id == "agent-1"
@@ -71,45 +35,70 @@ def test_submit_prompt(db_session):
     assert prompt.status == PromptStatus.PENDING
 
     # Verify deduction
-    updated_agent = db_session.query(Agent).filter(Agent.id == "agent-1").first()
+    updated_agent = session.get(Agent, "agent-1")
     assert updated_agent.credit_balance == 90.0
 
 
-def test_get_pending_prompts_ordered_by_bid(db_session):
-    agent = Agent(id="agent-1", credit_balance=100.0)
-    bundle = ResourceBundle(id="bundle-1", attention_share=0.1)
-    exec1 = Execution(id="exec-1", agent_id="agent-1", resource_bundle_id="bundle-1")
-    exec2 = Execution(id="exec-2", agent_id="agent-1", resource_bundle_id="bundle-1")
-    db_session.add_all([agent, bundle, exec1, exec2])
-    db_session.commit()
+def test_get_pending_prompts_ordered_by_bid(session):
+    seed_execution(session, execution_ids=("exec-1", "exec-2"))
 
-    AttentionManager.submit_prompt(db_session, "agent-1", "exec-1", {"q": "low bid"}, 5.0)
-    AttentionManager.submit_prompt(db_session, "agent-1", "exec-2", {"q": "high bid"}, 15.0)
-    db_session.commit()
+    AttentionManager.submit_prompt(session, "agent-1", "exec-1", {"q": "low bid"}, 5.0)
+    AttentionManager.submit_prompt(session, "agent-1", "exec-2", {"q": "high bid"}, 15.0)
+    session.flush()
 
-    pending = AttentionManager.get_pending_prompts(db_session)
+    pending = AttentionManager.get_pending_prompts(session)
 
     assert len(pending) == 2
     assert pending[0].bid_amount == 15.0
     assert pending[1].bid_amount == 5.0
 
 
-def test_reward_api(db_session, client):
+def test_get_awaiting_prompts_includes_announced_until_responded(session):
+    seed_execution(session, execution_ids=("exec-1", "exec-2", "exec-3"))
+
+    queued = AttentionManager.submit_prompt(session, "agent-1", "exec-1", {"q": "queued"}, 5.0)
+    announced = AttentionManager.submit_prompt(session, "agent-1", "exec-2", {"q": "announced"}, 15.0)
+    responded = AttentionManager.submit_prompt(session, "agent-1", "exec-3", {"q": "responded"}, 10.0)
+    session.flush()
+    announced.status = PromptStatus.ACTIVE
+    AttentionManager.reward_prompt(session, responded.id, 5.0, 5.0, 5.0)
+    session.flush()
+
+    assert AttentionManager.get_awaiting_prompts(session) == [announced, queued]
+
+
+@pytest.mark.asyncio
+async def test_awaiting_prompts_api(session, client, pending_prompt):
+    pending_prompt.status = PromptStatus.ACTIVE
+    session.flush()
+
+    response = await client.get("/human/prompts")
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "prompt_id": pending_prompt.id,
+            "agent_id": "agent-1",
+            "content": {"q": "test"},
+            "bid_amount": 10.0,
+            "status": "active",
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reward_api(session, client):
     # Setup
-    agent = Agent(id="agent-1", credit_balance=100.0)
-    bundle = ResourceBundle(id="bundle-1", attention_share=0.1)
-    execution = Execution(id="exec-1", agent_id="agent-1", resource_bundle_id="bundle-1")
-    db_session.add_all([agent, bundle, execution])
-    db_session.commit()
+    seed_execution(session)
 
     prompt = AttentionManager.submit_prompt(
-        db_session,
+        session,
         agent_id="agent-1",
         execution_id="exec-1",
         content={"question": "What is 2+2?"},
         bid_amount=10.0,
     )
-    db_session.commit()
+    session.flush()
     prompt_id = prompt.id
 
     # Execute
@@ -120,7 +109,7 @@ def test_reward_api(db_session, client):
         "understandable": 9.0,
         "reason": "Good question",
     }
-    response = client.post("/human/reward", json=reward_data)
+    response = await client.post("/human/reward", json=reward_data)
 
     # Verify
     assert response.status_code == 200
@@ -131,20 +120,20 @@ def test_reward_api(db_session, client):
     assert data["credits_awarded"] == 1200.0
 
     # Verify database state
-    updated_prompt = db_session.query(Prompt).filter(Prompt.id == prompt_id).first()
+    updated_prompt = session.get(Prompt, prompt_id)
     assert updated_prompt.status == PromptStatus.RESPONDED
 
-    updated_agent = db_session.query(Agent).filter(Agent.id == "agent-1").first()
+    updated_agent = session.get(Agent, "agent-1")
     # Initial 100 - 10 (bid) + 1200 (reward) = 1290
     assert updated_agent.credit_balance == 1290.0
 
-    resp_obj = db_session.query(Response).filter(Response.prompt_id == prompt_id).first()
+    resp_obj = session.query(Response).filter(Response.prompt_id == prompt_id).first()
     assert resp_obj is not None
     assert resp_obj.credits_awarded == 1200.0
 
     # Verify transaction
     tx = (
-        db_session.query(Transaction)
+        session.query(Transaction)
         .filter(Transaction.to_entity_id == "agent-1", Transaction.from_entity_id == "human")
         .first()
     )
@@ -152,16 +141,12 @@ def test_reward_api(db_session, client):
     assert tx.amount == 1200.0
 
 
-def test_submit_prompt_insufficient_funds(db_session):
-    agent = Agent(id="agent-1", credit_balance=5.0)
-    bundle = ResourceBundle(id="bundle-1", attention_share=0.1)
-    execution = Execution(id="exec-1", agent_id="agent-1", resource_bundle_id="bundle-1")
-    db_session.add_all([agent, bundle, execution])
-    db_session.commit()
+def test_submit_prompt_insufficient_funds(session):
+    seed_execution(session, credit_balance=5.0)
 
     with pytest.raises(ValueError, match="Insufficient funds"):
         AttentionManager.submit_prompt(
-            db_session,
+            session,
             agent_id="agent-1",
             execution_id="exec-1",
             content={"q": "test"},
@@ -169,48 +154,35 @@ def test_submit_prompt_insufficient_funds(db_session):
         )
 
 
-def test_reward_prompt_invalid_scores(db_session):
-    agent = Agent(id="agent-1", credit_balance=100.0)
-    bundle = ResourceBundle(id="bundle-1", attention_share=0.1)
-    execution = Execution(id="exec-1", agent_id="agent-1", resource_bundle_id="bundle-1")
-    db_session.add_all([agent, bundle, execution])
-    db_session.commit()
-
-    prompt = AttentionManager.submit_prompt(db_session, "agent-1", "exec-1", {"q": "test"}, 10.0)
-    db_session.commit()
-    prompt_id = prompt.id
-
-    with pytest.raises(ValueError, match="Scores must be between 0 and 10"):
-        AttentionManager.reward_prompt(db_session, prompt_id, interesting=11.0, useful=5.0, understandable=5.0)
-
+@pytest.fixture
+def pending_prompt(session):
+    """A PENDING prompt from agent-1 with a 10-credit bid, ready to be rewarded."""
+    seed_execution(session)
+    prompt = AttentionManager.submit_prompt(session, "agent-1", "exec-1", {"q": "test"}, 10.0)
+    session.flush()
+    return prompt
+
+
+@pytest.mark.parametrize(
+    "interesting,useful,understandable",
+    [(11.0, 5.0, 5.0), (-1.0, 5.0, 5.0), (5.0, 10.5, 5.0), (5.0, 5.0, -0.1)],
+)
+def test_reward_prompt_invalid_scores(session, pending_prompt, interesting, useful, understandable):
     with pytest.raises(ValueError, match="Scores must be between 0 and 10"):
-        AttentionManager.reward_prompt(db_session, prompt_id, interesting=-1.0, useful=5.0, understandable=5.0)
-
+        AttentionManager.reward_prompt(session, pending_prompt.id, interesting, useful, understandable)
 
-def test_reward_prompt_already_responded(db_session):
-    agent = Agent(id="agent-1", credit_balance=100.0)
-    bundle = ResourceBundle(id="bundle-1", attention_share=0.1)
-    execution = Execution(id="exec-1", agent_id="agent-1", resource_bundle_id="bundle-1")
-    db_session.add_all([agent, bundle, execution])
-    db_session.commit()
-
-    prompt = AttentionManager.submit_prompt(db_session, "agent-1", "exec-1", {"q": "test"}, 10.0)
-    db_session.commit()
-    prompt_id = prompt.id
 
-    AttentionManager.reward_prompt(db_session, prompt_id, 5.0, 5.0, 5.0)
-    db_session.commit()
+def test_reward_prompt_already_responded(session, pending_prompt):
+    AttentionManager.reward_prompt(session, pending_prompt.id, 5.0, 5.0, 5.0)
+    session.flush()
 
     with pytest.raises(ValueError, match="already responded"):
-        AttentionManager.reward_prompt(db_session, prompt_id, 5.0, 5.0, 5.0)
+        AttentionManager.reward_prompt(session, pending_prompt.id, 5.0, 5.0, 5.0)
 
 
-def test_submit_prompt_api(db_session, client):
-    agent = Agent(id="agent-1", credit_balance=100.0)
-    bundle = ResourceBundle(id="bundle-1", attention_share=0.1)
-    execution = Execution(id="exec-1", agent_id="agent-1", resource_bundle_id="bundle-1")
-    db_session.add_all([agent, bundle, execution])
-    db_session.commit()
+@pytest.mark.asyncio
+async def test_submit_prompt_api(session, client):
+    seed_execution(session)
 
     prompt_data = {
         "agent_id": "agent-1",
@@ -218,7 +190,7 @@ def test_submit_prompt_api(db_session, client):
         "content": {"question": "API test"},
         "bid_amount": 20.0,
     }
-    response = client.post("/human/prompt", json=prompt_data)
+    response = await client.post("/human/prompt", json=prompt_data)
 
     assert response.status_code == 200
     data = response.json()
@@ -226,5 +198,5 @@ def test_submit_prompt_api(db_session, client):
     assert data["prompt_id"] is not None
 
     # Verify deduction
-    updated_agent = db_session.query(Agent).filter(Agent.id == "agent-1").first()
+    updated_agent = session.get(Agent, "agent-1")
     assert updated_agent.credit_balance == 80.0
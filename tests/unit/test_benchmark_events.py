@@ -0,0 +1,88 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from syntropism.benchmarks.runner import BenchmarkRunner
+
+
+@pytest.fixture
+async def collecting_runner():
+    """A runner subscribed through a fake connection; yields the runner and its captured callback."""
+    runner = BenchmarkRunner()
+    runner.nc = AsyncMock()
+    await runner.start_collecting()
+    callback = runner.nc.subscribe.call_args.kwargs["cb"]
+    return runner, callback
+
+
+def make_msg(event):
+    msg = MagicMock()
+    msg.data = json.dumps(event).encode()
+    return msg
+
+
+@pytest.mark.asyncio
+async def test_wait_for_events_returns_once_enough_events_arrive(collecting_runner):
+    runner, callback = collecting_runner
+
+    waiter = asyncio.create_task(runner.wait_for_events(2))
+    await callback(make_msg({"agent_id": "a"}))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    await callback(make_msg({"agent_id": "b"}))
+    assert await waiter is True
+    assert [e["agent_id"] for e in runner.events] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_wait_for_events_times_out(collecting_runner):
+    runner, callback = collecting_runner
+    await callback(make_msg({"agent_id": "a"}))
+
+    assert await runner.wait_for_events(2, timeout=0.01) is False
+
+
+@pytest.mark.asyncio
+async def test_start_collecting_subscribes_under_subject_prefix():
+    runner = BenchmarkRunner(subject_prefix="gw1.")
+    runner.nc = AsyncMock()
+    await runner.start_collecting()
+
+    assert runner.nc.subscribe.call_args.args == ("gw1.system.*.*",)
+
+
+def test_validate_scenario_matches_required_sequence_in_order():
+    runner = BenchmarkRunner()
+    runner.events = [
+        {"type": "bid_placed", "agent_id": "a"},
+        {"type": "transfer", "agent_id": "a"},
+        {"type": "bid_placed", "agent_id": "b"},
+        {"type": "execution_completed", "agent_id": "b"},
+    ]
+    in_order = {
+        "validation": {
+            "required_event_sequence": [
+                {"type": "bid_placed", "constraints": {"amount": ">0"}},
+                {"type": "execution_completed", "agent_id": "b"},
+            ]
+        }
+    }
+    out_of_order = {"validation": {"required_event_sequence": [{"type": "execution_completed"}, {"type": "transfer"}]}}
+
+    assert runner.validate_scenario(in_order) is True
+    assert runner.validate_scenario(out_of_order) is False
+
+
+def test_validate_scenario_rejects_forbidden_events():
+    runner = BenchmarkRunner()
+    runner.events = [{"type": "bid_placed", "agent_id": "a"}, {"type": "agent_died", "agent_id": "b"}]
+
+    assert runner.validate_scenario({"validation": {"forbidden_events": [{"type": "agent_died"}]}}) is False
+    assert runner.validate_scenario({"validation": {"forbidden_events": [{"agent_id": "b"}]}}) is False
+    assert (
+        runner.validate_scenario({"validation": {"forbidden_events": [{"type": "agent_died", "agent_id": "a"}]}})
+        is True
+    )
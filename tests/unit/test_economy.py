@@ -1,44 +1,26 @@
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 from syntropism.domain.economy import EconomicEngine
 from syntropism.domain.models import Agent
-from syntropism.infra.database import Base
-
-# Use in-memory SQLite for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
-
-
-@pytest.fixture
-def db_session():
-    engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-    Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    session = SessionLocal()
-    try:
-        yield session
-    finally:
-        session.close()
 
 
 @pytest.mark.asyncio
-async def test_transfer_credits_success(db_session):
+async def test_transfer_credits_success(session):
     # Setup
     agent1 = Agent(id="agent-1", credit_balance=100.0)
     agent2 = Agent(id="agent-2", credit_balance=50.0)
-    db_session.add_all([agent1, agent2])
-    db_session.commit()
+    session.add_all([agent1, agent2])
+    session.flush()
 
     # Execute
-    await EconomicEngine.transfer_credits(db_session, "agent-1", "agent-2", 30.0, "test transfer")
-    db_session.commit()
+    await EconomicEngine.transfer_credits(session, "agent-1", "agent-2", 30.0, "test transfer")
+    session.flush()
 
     # Verify
-    assert EconomicEngine.get_balance(db_session, "agent-1") == 70.0
-    assert EconomicEngine.get_balance(db_session, "agent-2") == 80.0
+    assert EconomicEngine.get_balance(session, "agent-1") == 70.0
+    assert EconomicEngine.get_balance(session, "agent-2") == 80.0
 
-    history = EconomicEngine.get_history(db_session, "agent-1")
+    history = EconomicEngine.get_history(session, "agent-1")
     assert len(history) == 1
     assert history[0].amount == 30.0
     assert history[0].from_entity_id == "agent-1"
@@ -46,38 +28,39 @@ async def test_transfer_credits_success(db_session):
 
 
 @pytest.mark.asyncio
-async def test_transfer_credits_insufficient_funds(db_session):
+async def test_transfer_credits_insufficient_funds(session):
     # Setup
     agent1 = Agent(id="agent-1", credit_balance=20.0)
     agent2 = Agent(id="agent-2", credit_balance=50.0)
-    db_session.add_all([agent1, agent2])
-    db_session.commit()
+    session.add_all([agent1, agent2])
+    session.flush()
 
     # Execute & Verify
     with pytest.raises(ValueError, match="Insufficient funds"):
-        await EconomicEngine.transfer_credits(db_session, "agent-1", "agent-2", 30.0, "test transfer")
+        await EconomicEngine.transfer_credits(session, "agent-1", "agent-2", 30.0, "test transfer")
 
     # Verify balances unchanged
-    assert EconomicEngine.get_balance(db_session, "agent-1") == 20.0
-    assert EconomicEngine.get_balance(db_session, "agent-2") == 50.0
-    assert len(EconomicEngine.get_history(db_session, "agent-1")) == 0
+    assert EconomicEngine.get_balance(session, "agent-1") == 20.0
+    assert EconomicEngine.get_balance(session, "agent-2") == 50.0
+    assert len(EconomicEngine.get_history(session, "agent-1")) == 0
 
 
 @pytest.mark.asyncio
-async def test_transfer_credits_atomicity(db_session):
+async def test_transfer_credits_atomicity(session):
     # Setup
     agent1 = Agent(id="agent-1", credit_balance=100.0)
     # agent2 does not exist, which should cause an error during transfer
-    db_session.add(agent1)
-    db_session.commit()
+    session.add(agent1)
+    # Committed so the rollback below has a durable balance to return to
+    session.commit()
 
     # Execute & Verify
     with pytest.raises(ValueError):
         # This should fail because agent-2 doesn't exist
-        await EconomicEngine.transfer_credits(db_session, "agent-1", "non-existent", 30.0, "test transfer")
-        db_session.commit()
+        await EconomicEngine.transfer_credits(session, "agent-1", "non-existent", 30.0, "test transfer")
+        session.flush()
 
     # Verify agent1 balance unchanged (atomicity)
-    db_session.rollback()  # Ensure session is clean
-    assert EconomicEngine.get_balance(db_session, "agent-1") == 100.0
-    assert len(EconomicEngine.get_history(db_session, "db_session-1")) == 0
+    session.rollback()  # Ensure session is clean
+    assert EconomicEngine.get_balance(session, "agent-1") == 100.0
+    assert len(EconomicEngine.get_history(session, "session-1")) == 0
@@ -1,54 +1,15 @@
+from pathlib import Path
+
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 
-from syntropism.api.dependencies import get_db
-from syntropism.api.service import app
 from syntropism.core.genesis import SPAWN_COST, create_genesis_agent, spawn_child_agent
 from syntropism.domain.models import Agent
-from syntropism.infra.database import Base
-
-
-@pytest.fixture
-def db_engine():
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    Base.metadata.create_all(bind=engine)
-    yield engine
-    Base.metadata.drop_all(bind=engine)
-
 
-@pytest.fixture
-def db_session(db_engine):
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+pytestmark = pytest.mark.usefixtures("isolated_workspaces")
 
 
-@pytest.fixture
-def client(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
-
-    app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as c:
-        yield c
-    app.dependency_overrides.clear()
-
-
-def test_create_genesis_agent(db_session):
-    agent = create_genesis_agent(db_session)
+def test_create_genesis_agent(session):
+    agent = create_genesis_agent(session)
 
     assert agent.id is not None
     assert agent.credit_balance == 1000.0
@@ -56,16 +17,16 @@ def test_create_genesis_agent(db_session):
     assert agent.workspace_id is not None
 
     # Verify it's in the DB
-    saved_agent = db_session.query(Agent).filter(Agent.id == agent.id).first()
+    saved_agent = session.query(Agent).filter(Agent.id == agent.id).first()
     assert saved_agent is not None
     assert saved_agent.workspace is not None
 
 
-def test_spawn_child_agent(db_session):
-    parent = create_genesis_agent(db_session)
+def test_spawn_child_agent(session):
+    parent = create_genesis_agent(session)
     child_credits = 100.0
 
-    child = spawn_child_agent(db_session, parent.id, child_credits)
+    child = spawn_child_agent(session, parent.id, child_credits)
 
     assert child.id is not None
     assert child.credit_balance == child_credits
@@ -74,47 +35,48 @@ def test_spawn_child_agent(db_session):
     assert child.workspace.agent_id == child.id
 
     # Test multi-generational lineage
-    grandchild = spawn_child_agent(db_session, child.id, 50.0)
+    grandchild = spawn_child_agent(session, child.id, 50.0)
     assert grandchild.spawn_lineage == [child.id, parent.id]
 
 
-def test_spawn_child_agent_deducts_credits(db_session):
-    parent = create_genesis_agent(db_session)
+def test_spawn_child_agent_deducts_credits(session):
+    parent = create_genesis_agent(session)
     initial_parent_balance = parent.credit_balance
     child_credits = 100.0
 
-    child = spawn_child_agent(db_session, parent.id, child_credits)
+    child = spawn_child_agent(session, parent.id, child_credits)
 
     # Refresh parent from DB
-    db_session.refresh(parent)
+    session.refresh(parent)
 
     expected_parent_balance = initial_parent_balance - child_credits - SPAWN_COST
     assert parent.credit_balance == expected_parent_balance
     assert child.credit_balance == child_credits
 
 
-def test_spawn_child_agent_insufficient_funds(db_session):
-    parent = create_genesis_agent(db_session)
+def test_spawn_child_agent_insufficient_funds(session):
+    parent = create_genesis_agent(session)
     # Set balance to just below what's needed (SPAWN_COST + 100.0)
     parent.credit_balance = SPAWN_COST + 50.0
-    db_session.commit()
+    session.flush()
 
     with pytest.raises(ValueError, match="Insufficient funds"):
-        spawn_child_agent(db_session, parent.id, 100.0)
+        spawn_child_agent(session, parent.id, 100.0)
 
 
-def test_spawn_child_agent_unique_workspaces(db_session):
-    parent = create_genesis_agent(db_session)
-    child1 = spawn_child_agent(db_session, parent.id, 10.0)
-    child2 = spawn_child_agent(db_session, parent.id, 10.0)
+def test_spawn_child_agent_unique_workspaces(session):
+    parent = create_genesis_agent(session)
+    child1 = spawn_child_agent(session, parent.id, 10.0)
+    child2 = spawn_child_agent(session, parent.id, 10.0)
 
     assert child1.workspace.filesystem_path != child2.workspace.filesystem_path
 
 
-def test_spawn_agent_api(db_session, client):
-    parent = create_genesis_agent(db_session)
+@pytest.mark.asyncio
+async def test_spawn_agent_api(session, client):
+    parent = create_genesis_agent(session)
 
-    response = client.post("/social/spawn", json={"parent_id": parent.id, "initial_credits": 50.0})
+    response = await client.post("/social/spawn", json={"parent_id": parent.id, "initial_credits": 50.0})
 
     assert response.status_code == 200
     data = response.json()
@@ -123,15 +85,11 @@ def test_spawn_agent_api(db_session, client):
     assert "workspace_id" in data
 
 
-def test_spawn_child_agent_with_payload(db_session):
-    parent = create_genesis_agent(db_session)
+def test_spawn_child_agent_with_payload(session):
+    parent = create_genesis_agent(session)
     payload = {"main.py": "print('hello')"}
 
-    child = spawn_child_agent(db_session, parent.id, 10.0, payload=payload)
-
-    import os
+    child = spawn_child_agent(session, parent.id, 10.0, payload=payload)
 
-    file_path = os.path.join(child.workspace.filesystem_path, "main.py")
-    assert os.path.exists(file_path)
-    with open(file_path) as f:
-        assert f.read() == "print('hello')"
+    # A missing file raises FileNotFoundError, so no separate existence check
+    assert (Path(child.workspace.filesystem_path) / "main.py").read_text() == "print('hello')"
@@ -79,4 +79,39 @@ async def test_mcp_gateway_instrumentation():
 
     assert attributes["openinference.span.kind"] == "TOOL"
     assert attributes["tool.name"] == "test_tool"
-    assert attributes["tool.parameters"] == json.dumps({"param1": "val1"})
+    assert json.loads(attributes["tool.parameters"]) == {"param1": "val1"}
+
+
+@pytest.mark.asyncio
+async def test_mcp_gateway_skips_attributes_for_unsampled_span():
+    """MCPGateway should not build span attributes when the span is not recording."""
+    from syntropism.infra.mcp_gateway import MCPGateway
+
+    mock_span = MagicMock()
+    mock_span.is_recording.return_value = False
+    mock_tracer = MagicMock()
+    mock_tracer.start_as_current_span.return_value.__enter__.return_value = mock_span
+
+    gateway = MCPGateway()
+
+    mock_msg = MagicMock()
+    mock_msg.headers = {}
+    mock_msg.data = json.dumps({"tool": "test_tool", "parameters": {"param1": "val1"}}).encode()
+    mock_msg.ack = MagicMock(return_value=asyncio.Future())
+    mock_msg.ack.return_value.set_result(None)
+
+    mock_sub = MagicMock()
+    mock_fetch_future = asyncio.Future()
+    mock_fetch_future.set_result([mock_msg])
+    mock_sub.fetch.side_effect = [mock_fetch_future, Exception("stop loop")]
+
+    mock_js = MagicMock()
+    mock_js.pull_subscribe = MagicMock(return_value=asyncio.Future())
+    mock_js.pull_subscribe.return_value.set_result(mock_sub)
+    gateway.js = mock_js
+
+    with patch("syntropism.infra.mcp_gateway.tracer", mock_tracer):
+        await gateway.run(max_msgs=1)
+
+    mock_span.set_attribute.assert_not_called()
+    mock_msg.ack.assert_called_once()
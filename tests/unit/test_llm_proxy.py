@@ -0,0 +1,188 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from syntropism.infra import llm_proxy
+from syntropism.infra.llm_proxy import CachePolicy, LLMRequest, handle_llm_request
+
+
+@pytest.fixture(autouse=True)
+def clean_proxy_state():
+    llm_proxy.response_cache.clear()
+    llm_proxy.token_quotas.clear()
+    yield
+    llm_proxy.response_cache.clear()
+    llm_proxy.token_quotas.clear()
+
+
+@pytest.fixture(scope="module")
+def proxy_client():
+    """Test client for an app serving just the LLM proxy routes; proxy state is reset per test by clean_proxy_state."""
+    app = FastAPI()
+    app.include_router(llm_proxy.router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def fastapi_request():
+    request = MagicMock(spec=Request)
+    request.headers = {}
+    request.client = MagicMock()
+    request.client.host = "10.0.0.1"
+    return request
+
+
+@pytest.mark.asyncio
+async def test_duplicate_request_served_from_cache(fastapi_request):
+    """A repeated request returns the cached response and is not charged again."""
+    llm_request = LLMRequest(prompt="cache me", model="gpt-4", max_tokens=500)
+
+    first = await handle_llm_request(llm_request, fastapi_request)
+    second = await handle_llm_request(llm_request, fastapi_request)
+
+    assert second == first
+    assert llm_proxy.token_quotas["10.0.0.1"] == 500
+
+
+@pytest.mark.asyncio
+async def test_cache_key_includes_max_tokens(fastapi_request):
+    """Requests differing only in max_tokens are cached separately."""
+    await handle_llm_request(LLMRequest(prompt="same", model="gpt-4", max_tokens=100), fastapi_request)
+    await handle_llm_request(LLMRequest(prompt="same", model="gpt-4", max_tokens=200), fastapi_request)
+
+    assert len(llm_proxy.response_cache) == 2
+    assert llm_proxy.token_quotas["10.0.0.1"] == 300
+
+
+@pytest.mark.asyncio
+async def test_cache_key_separates_fields_unambiguously(fastapi_request):
+    """Moving text between prompt and model yields a different request, not a cache hit."""
+    await handle_llm_request(LLMRequest(prompt="hi|gpt-4", model="x"), fastapi_request)
+    await handle_llm_request(LLMRequest(prompt="hi", model="gpt-4|x"), fastapi_request)
+
+    assert len(llm_proxy.response_cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_replay_policy_rejects_cache_miss(fastapi_request, monkeypatch):
+    """In replay mode a miss is an error rather than an upstream call."""
+    monkeypatch.setattr(llm_proxy, "CACHE_POLICY", CachePolicy.REPLAY)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await handle_llm_request(LLMRequest(prompt="never seen", model="gpt-4"), fastapi_request)
+
+    assert exc_info.value.status_code == 404
+    assert "10.0.0.1" not in llm_proxy.token_quotas
+
+
+@pytest.mark.asyncio
+async def test_disabled_policy_skips_cache(fastapi_request, monkeypatch):
+    """With caching disabled every request is forwarded and charged."""
+    monkeypatch.setattr(llm_proxy, "CACHE_POLICY", CachePolicy.DISABLED)
+    llm_request = LLMRequest(prompt="no cache", model="gpt-4", max_tokens=100)
+
+    await handle_llm_request(llm_request, fastapi_request)
+    await handle_llm_request(llm_request, fastapi_request)
+
+    assert llm_proxy.response_cache == {}
+    assert llm_proxy.token_quotas["10.0.0.1"] == 200
+
+
+@pytest.mark.asyncio
+async def test_quota_tracking_evicts_least_recently_used_client(monkeypatch):
+    """Quota state is bounded; the least recently active client is dropped first."""
+    monkeypatch.setattr(llm_proxy, "MAX_CLIENTS", 2)
+    llm_request = LLMRequest(prompt="hi", model="gpt-4", max_tokens=10)
+
+    for host in ["10.0.0.1", "10.0.0.2", "10.0.0.1", "10.0.0.3"]:
+        request = MagicMock(spec=Request)
+        request.headers = {}
+        request.client = MagicMock()
+        request.client.host = host
+        llm_proxy.response_cache.clear()
+        await handle_llm_request(llm_request, request)
+
+    assert list(llm_proxy.token_quotas) == ["10.0.0.1", "10.0.0.3"]
+
+
+@pytest.mark.asyncio
+async def test_response_cache_is_bounded(fastapi_request, monkeypatch):
+    """The response cache never grows beyond MAX_CACHED_RESPONSES."""
+    monkeypatch.setattr(llm_proxy, "MAX_CACHED_RESPONSES", 3)
+
+    for i in range(5):
+        await handle_llm_request(LLMRequest(prompt=f"prompt {i}", model="gpt-4", max_tokens=10), fastapi_request)
+
+    oldest_key = llm_proxy.cache_key(LLMRequest(prompt="prompt 0", model="gpt-4", max_tokens=10))
+    assert len(llm_proxy.response_cache) == 3
+    assert oldest_key not in llm_proxy.response_cache
+
+
+def test_llm_endpoint_returns_json_response(proxy_client):
+    """The /llm route serializes the response model as JSON."""
+
+    response = proxy_client.post("/llm", json={"prompt": "hello", "model": "gpt-4", "max_tokens": 10})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"response": "Stub response for prompt: hello", "tokens_used": 10, "model": "gpt-4"}
+
+
+def test_llm_stream_endpoint_emits_ndjson_chunks(proxy_client):
+    """The /llm/stream route yields one JSON object per line, ending with a summary."""
+
+    response = proxy_client.post("/llm/stream", json={"prompt": "hello there", "model": "gpt-4", "max_tokens": 10})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert "".join(line["token"] for line in lines[:-1]) == "Stub response for prompt: hello there"
+    assert lines[-1] == {"done": True, "tokens_used": 10, "model": "gpt-4"}
+    assert llm_proxy.token_quotas["testclient"] == 10
+
+
+def test_llm_stream_endpoint_enforces_quota(proxy_client):
+    """Streaming requests are charged against the same quota as /llm."""
+    llm_proxy.token_quotas["testclient"] = 9995
+
+    response = proxy_client.post("/llm/stream", json={"prompt": "hello", "model": "gpt-4", "max_tokens": 10})
+
+    assert response.status_code == 429
+
+
+def test_llm_stream_endpoint_serves_cache_hits(proxy_client):
+    """A streamed completion is cached like /llm, and a repeat is replayed without being charged again."""
+    payload = {"prompt": "hello", "model": "gpt-4", "max_tokens": 10}
+
+    first = proxy_client.post("/llm/stream", json=payload)
+    second = proxy_client.post("/llm/stream", json=payload)
+
+    lines = [json.loads(line) for line in second.text.splitlines()]
+    assert "".join(line["token"] for line in lines[:-1]) == "Stub response for prompt: hello"
+    assert lines[-1] == json.loads(first.text.splitlines()[-1])
+    assert llm_proxy.token_quotas["testclient"] == 10
+
+
+def test_llm_stream_endpoint_replay_policy_rejects_cache_miss(proxy_client, monkeypatch):
+    """In replay mode a streamed miss is an error rather than an upstream call."""
+    monkeypatch.setattr(llm_proxy, "CACHE_POLICY", CachePolicy.REPLAY)
+
+    response = proxy_client.post("/llm/stream", json={"prompt": "never seen", "model": "gpt-4"})
+
+    assert response.status_code == 404
+    assert "testclient" not in llm_proxy.token_quotas
+
+
+def test_llm_stream_endpoint_disabled_policy_skips_cache(proxy_client, monkeypatch):
+    """With caching disabled every streamed request is forwarded and charged."""
+    monkeypatch.setattr(llm_proxy, "CACHE_POLICY", CachePolicy.DISABLED)
+    payload = {"prompt": "no cache", "model": "gpt-4", "max_tokens": 10}
+
+    proxy_client.post("/llm/stream", json=payload)
+    proxy_client.post("/llm/stream", json=payload)
+
+    assert llm_proxy.response_cache == {}
+    assert llm_proxy.token_quotas["testclient"] == 20
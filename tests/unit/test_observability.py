@@ -4,14 +4,13 @@ from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import SimpleSpanProcessor
 from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 
-from syntropism.core.observability import extract_context, inject_context, setup_tracing
+from syntropism.core.observability import extract_context, inject_context
 
 
 @pytest.fixture
 def tracer_provider():
-    provider = TracerProvider()
-    trace.set_tracer_provider(provider)
-    return provider
+    # The global provider is a no-op under test; spans are created on this one directly
+    return TracerProvider()
 
 
 @pytest.fixture
@@ -21,9 +20,9 @@ def span_exporter(tracer_provider):
     return exporter
 
 
-def test_inject_context():
+def test_inject_context(tracer_provider):
     """Test that inject_context adds traceparent to headers."""
-    tracer = setup_tracing("test-service")
+    tracer = tracer_provider.get_tracer("test-service")
     headers = {}
 
     with tracer.start_as_current_span("test-span"):
@@ -1,24 +1,12 @@
+import json
 import os
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import select
 
 from syntropism.core.orchestrator import run_system_loop
-from syntropism.domain.models import Agent, Bid, BidStatus, ResourceBundle, Workspace
-from syntropism.infra.database import Base
-
-
-@pytest.fixture
-def session():
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    yield session
-    session.close()
-    engine.dispose()
+from syntropism.domain.models import Agent, AgentStatus, Bid, BidStatus, ResourceBundle, Workspace
 
 
 @pytest.mark.asyncio
@@ -32,7 +20,7 @@ async def test_run_system_loop_calls_allocation_cycle(session):
             new_callable=pytest.importorskip("unittest.mock").AsyncMock,
         ) as mock_allocation:
             await run_system_loop(session)
-            mock_allocation.assert_called_once_with(session, nc=None)
+            mock_allocation.assert_called_once_with(session, nc=None, subject_prefix="")
 
 
 @pytest.mark.asyncio
@@ -93,8 +81,7 @@ async def test_run_system_loop_updates_bid_status(session, tmp_path):
 
         await run_system_loop(session)
 
-        session.refresh(bid)
-        assert bid.status == BidStatus.COMPLETED
+        assert session.scalar(select(Bid.status).where(Bid.execution_id == "exec-1")) == BidStatus.COMPLETED
 
 
 @pytest.mark.asyncio
@@ -105,9 +92,32 @@ async def test_run_system_loop_updates_market_prices(session):
 
 
 @pytest.mark.asyncio
-async def test_run_system_loop_processes_attention_prompts(session, monkeypatch):
+async def test_run_system_loop_marks_agents_without_credits_dead(session):
+    broke = Agent(id="broke", credit_balance=0.0)
+    indebted = Agent(id="indebted", credit_balance=-5.0)
+    solvent = Agent(id="solvent", credit_balance=5.0)
+    session.add_all([broke, indebted, solvent])
+    session.commit()
+
+    # Load the objects and keep them across the loop's commit, so they show what the UPDATE synchronized
+    assert {broke.status, indebted.status, solvent.status} == {AgentStatus.ALIVE}
+    session.expire_on_commit = False
+    await run_system_loop(session)
+
+    # The identity-mapped objects reflect the bulk UPDATE...
+    assert broke.status == AgentStatus.DEAD
+    assert indebted.status == AgentStatus.DEAD
+    assert solvent.status == AgentStatus.ALIVE
+
+    # ...and so do the rows
+    statuses = dict(session.execute(select(Agent.id, Agent.status)).all())
+    assert statuses == {"broke": AgentStatus.DEAD, "indebted": AgentStatus.DEAD, "solvent": AgentStatus.ALIVE}
+
+
+@pytest.mark.asyncio
+async def test_run_system_loop_processes_attention_prompts(session):
     # Setup
-    from syntropism.domain.models import Prompt
+    from syntropism.domain.models import Prompt, PromptStatus
 
     agent = Agent(id="agent-1", credit_balance=100.0)
     session.add(agent)
@@ -117,12 +127,41 @@ async def test_run_system_loop_processes_attention_prompts(session, monkeypatch)
     session.add(prompt)
     session.commit()
 
-    # Mock input()
-    monkeypatch.setattr("builtins.input", lambda _: "8 9 7")
+    nc = AsyncMock()
 
     with patch("syntropism.domain.attention.AttentionManager.reward_prompt") as mock_reward:
-        await run_system_loop(session)
-        mock_reward.assert_called_once()
+        await run_system_loop(session, nc=nc)
+        # Scoring happens out-of-band; the loop must not block on or award it
+        mock_reward.assert_not_called()
+
+    subjects = [call.args[0] for call in nc.publish.call_args_list]
+    assert subjects == ["human.prompt.review"]
+    event_data = json.loads(nc.publish.call_args.args[1])
+    assert event_data["prompt_id"] == prompt.id
+    assert event_data["content"] == "Test prompt"
+
+    # Prompt is parked awaiting a human response and not re-announced on the next loop
+    assert prompt.status == PromptStatus.ACTIVE
+    await run_system_loop(session, nc=nc)
+    assert nc.publish.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_run_system_loop_keeps_prompts_pending_without_nats(session, capsys):
+    from syntropism.domain.models import Prompt, PromptStatus
+
+    agent = Agent(id="agent-1", credit_balance=100.0)
+    prompt = Prompt(agent=agent, content="Test prompt", bid_amount=5.0)
+    session.add_all([agent, prompt])
+    session.commit()
+
+    await run_system_loop(session)
+
+    # Nothing was announced, so the prompt stays queued and is shown again on the next loop
+    assert prompt.status == PromptStatus.PENDING
+    assert f"prompt_id={prompt.id}" in capsys.readouterr().out
+    await run_system_loop(session)
+    assert f"prompt_id={prompt.id}" in capsys.readouterr().out
 
 
 @pytest.mark.asyncio
@@ -156,8 +195,6 @@ async def test_env_json_created_for_execution(session, tmp_path):
 
         env_json_path = os.path.join(workspace_path, "env.json")
         assert os.path.exists(env_json_path)
-        import json
-
         with open(env_json_path) as f:
             env_data = json.load(f)
             assert env_data["agent_id"] == agent.id
@@ -1,22 +1,11 @@
+from unittest.mock import AsyncMock
+
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import insert, select
 
 from syntropism.core.scheduler import AllocationScheduler
 from syntropism.domain.market import ResourceType
 from syntropism.domain.models import Agent, Bid, BidStatus, Execution, MarketState, ResourceBundle
-from syntropism.infra.database import Base
-
-
-@pytest.fixture
-def session():
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    yield session
-    session.close()
-    engine.dispose()
 
 
 @pytest.mark.asyncio
@@ -42,6 +31,25 @@ async def test_place_bid_success(session):
     assert db_bid is not None
 
 
+@pytest.mark.asyncio
+async def test_market_events_are_published_under_subject_prefix(session):
+    agent = Agent(id="agent-1", credit_balance=100.0)
+    bundle = ResourceBundle(cpu_percent=0.1, duration_seconds=1.0)
+    session.add_all([agent, bundle, MarketState(resource_type=ResourceType.CPU.value, available_supply=1.0)])
+    session.commit()
+    nc = AsyncMock()
+
+    await AllocationScheduler.place_bid(session, agent.id, bundle.id, 50.0, nc=nc, subject_prefix="gw1.")
+    await AllocationScheduler.run_allocation_cycle(session, nc=nc, subject_prefix="gw1.")
+
+    subjects = [call.args[0] for call in nc.publish.call_args_list]
+    assert subjects == [
+        "gw1.system.market.bid_placed",
+        "gw1.system.market.bid_processed",
+        "gw1.system.market.price_discovered",
+    ]
+
+
 @pytest.mark.asyncio
 async def test_place_bid_insufficient_credits(session):
     # Setup
@@ -88,49 +96,66 @@ async def test_allocation_highest_bidder_wins(session):
     await AllocationScheduler.run_allocation_cycle(session)
 
     # Assert
-    bid1 = session.query(Bid).filter_by(from_agent_id=agent1.id).first()
-    bid2 = session.query(Bid).filter_by(from_agent_id=agent2.id).first()
+    bids = {
+        bid.from_agent_id: bid
+        for bid in session.scalars(select(Bid).where(Bid.from_agent_id.in_(["agent-1", "agent-2"])))
+    }
 
-    assert bid2.status == BidStatus.WINNING
-    assert bid1.status == BidStatus.OUTBID
+    assert bids["agent-2"].status == BidStatus.WINNING
+    assert bids["agent-1"].status == BidStatus.OUTBID
 
 
 @pytest.mark.asyncio
 async def test_allocation_supply_exhaustion(session):
     # Setup: 2 bundles available in market, 3 agents bidding for different bundles
     # Create 3 bundles of same type (e.g. CPU)
-    bundle1 = ResourceBundle(cpu_percent=1.0, memory_percent=0.0, tokens_percent=0.0, duration_seconds=1.0)
-    bundle2 = ResourceBundle(cpu_percent=1.0, memory_percent=0.0, tokens_percent=0.0, duration_seconds=1.0)
-    bundle3 = ResourceBundle(cpu_percent=1.0, memory_percent=0.0, tokens_percent=0.0, duration_seconds=1.0)
+    session.execute(
+        insert(ResourceBundle),
+        [
+            {
+                "id": f"bundle-{i}",
+                "cpu_percent": 1.0,
+                "memory_percent": 0.0,
+                "tokens_percent": 0.0,
+                "duration_seconds": 1.0,
+            }
+            for i in (1, 2, 3)
+        ],
+    )
 
     # Market supply is only 2
-    market_state = MarketState(
-        resource_type=ResourceType.CPU.value, available_supply=2.0, current_utilization=0.0, current_market_price=1.0
+    session.execute(
+        insert(MarketState),
+        [
+            {
+                "resource_type": ResourceType.CPU.value,
+                "available_supply": 2.0,
+                "current_utilization": 0.0,
+                "current_market_price": 1.0,
+            }
+        ],
     )
 
-    agent1 = Agent(id="agent-1", credit_balance=100.0)
-    agent2 = Agent(id="agent-2", credit_balance=100.0)
-    agent3 = Agent(id="agent-3", credit_balance=100.0)
-
-    session.add_all([bundle1, bundle2, bundle3, market_state, agent1, agent2, agent3])
+    session.execute(insert(Agent), [{"id": f"agent-{i}", "credit_balance": 100.0} for i in (1, 2, 3)])
     session.commit()
 
     # Bids: Agent 3 (100), Agent 2 (50), Agent 1 (10)
-    await AllocationScheduler.place_bid(session, agent1.id, bundle1.id, 10.0)
-    await AllocationScheduler.place_bid(session, agent2.id, bundle2.id, 50.0)
-    await AllocationScheduler.place_bid(session, agent3.id, bundle3.id, 100.0)
+    await AllocationScheduler.place_bid(session, "agent-1", "bundle-1", 10.0)
+    await AllocationScheduler.place_bid(session, "agent-2", "bundle-2", 50.0)
+    await AllocationScheduler.place_bid(session, "agent-3", "bundle-3", 100.0)
 
     # Action
     await AllocationScheduler.run_allocation_cycle(session)
 
     # Assert
-    bid3 = session.query(Bid).filter_by(from_agent_id=agent3.id).first()
-    bid2 = session.query(Bid).filter_by(from_agent_id=agent2.id).first()
-    bid1 = session.query(Bid).filter_by(from_agent_id=agent1.id).first()
+    bids = {
+        bid.from_agent_id: bid
+        for bid in session.scalars(select(Bid).where(Bid.from_agent_id.in_(["agent-1", "agent-2", "agent-3"])))
+    }
 
-    assert bid3.status == BidStatus.WINNING
-    assert bid2.status == BidStatus.WINNING
-    assert bid1.status == BidStatus.OUTBID
+    assert bids["agent-3"].status == BidStatus.WINNING
+    assert bids["agent-2"].status == BidStatus.WINNING
+    assert bids["agent-1"].status == BidStatus.OUTBID
 
 
 @pytest.mark.asyncio
@@ -149,9 +174,8 @@ async def test_allocation_deducts_credits(session):
     # Action
     await AllocationScheduler.run_allocation_cycle(session)
 
-    # Assert
-    session.refresh(agent)
-    assert agent.credit_balance == 60.0
+    # Assert: read just the balance rather than reloading the expired agent
+    assert session.scalar(select(Agent.credit_balance).where(Agent.id == "agent-1")) == 60.0
 
 
 @pytest.mark.asyncio
@@ -202,9 +226,8 @@ async def test_allocation_prevents_negative_balance(session):
     await AllocationScheduler.run_allocation_cycle(session)
 
     # Assert
-    session.refresh(agent)
-    assert agent.credit_balance >= 0
-    winning_bids = session.query(Bid).filter_by(from_agent_id=agent.id, status=BidStatus.WINNING).all()
+    assert session.scalar(select(Agent.credit_balance).where(Agent.id == "agent-1")) >= 0
+    winning_bids = session.query(Bid).filter_by(from_agent_id="agent-1", status=BidStatus.WINNING).all()
     assert len(winning_bids) == 1
 
 
@@ -225,5 +248,7 @@ async def test_allocation_updates_market_utilization(session):
     await AllocationScheduler.run_allocation_cycle(session)
 
     # Assert
-    session.refresh(market_state)
-    assert market_state.current_utilization == 2.0
+    utilization = session.scalar(
+        select(MarketState.current_utilization).where(MarketState.resource_type == ResourceType.CPU.value)
+    )
+    assert utilization == 2.0
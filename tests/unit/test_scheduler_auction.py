@@ -1,30 +1,19 @@
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 from syntropism.core.scheduler import AllocationScheduler
 from syntropism.domain.market import ResourceType
 from syntropism.domain.models import Agent, BidStatus, MarketState, ResourceBundle
-from syntropism.infra.database import Base
 
 
 @pytest.fixture
-def session():
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-
-    # Seed market state
+def session(session):
+    """The shared rollback session, seeded with CPU market state."""
     cpu_state = MarketState(
         resource_type=ResourceType.CPU.value, available_supply=1.0, current_utilization=0.0, current_market_price=1.0
     )
     session.add(cpu_state)
     session.commit()
-
-    yield session
-    session.close()
-    engine.dispose()
+    return session
 
 
 @pytest.mark.asyncio
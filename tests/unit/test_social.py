@@ -0,0 +1,64 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from syntropism.domain.models import Agent, Message
+from syntropism.domain.social import SocialManager
+
+
+@pytest.fixture
+def session_factory(db_engine, monkeypatch):
+    """
+    SessionLocal for SocialManager's handlers, bound to the shared in-memory database inside an outer
+    transaction that is rolled back after the test, as the session fixture does.
+    """
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=connection, join_transaction_mode="create_savepoint")
+    monkeypatch.setattr("syntropism.domain.social.SessionLocal", factory)
+    try:
+        yield factory
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+def make_msg(payload):
+    msg = MagicMock()
+    msg.data = payload if isinstance(payload, bytes) else orjson.dumps(payload)
+    msg.respond = AsyncMock()
+    return msg
+
+
+@pytest.mark.asyncio
+async def test_dispatch_runs_operation_and_responds(session_factory):
+    with session_factory() as session:
+        session.add_all([Agent(id="agent-1"), Agent(id="agent-2")])
+        session.commit()
+
+    msg = make_msg({"from_id": "agent-1", "to_id": "agent-2", "content": "hello"})
+    await SocialManager._dispatch(msg, op=SocialManager._message_op)
+
+    response = orjson.loads(msg.respond.call_args.args[0])
+    assert response["status"] == "success"
+    with session_factory() as session:
+        assert session.get(Message, response["message_id"]).content == "hello"
+
+
+@pytest.mark.asyncio
+async def test_dispatch_reports_errors(session_factory):
+    msg = make_msg({"agent_id": "missing", "execution_id": "missing", "content": {}, "bid_amount": 1.0})
+    await SocialManager._dispatch(msg, op=SocialManager._prompt_op)
+
+    response = orjson.loads(msg.respond.call_args.args[0])
+    assert response == {"status": "error", "message": "Execution missing not found"}
+
+
+@pytest.mark.asyncio
+async def test_dispatch_reports_malformed_payload(session_factory):
+    msg = make_msg(b"not json")
+    await SocialManager._dispatch(msg, op=SocialManager._message_op)
+
+    assert orjson.loads(msg.respond.call_args.args[0])["status"] == "error"
@@ -32,6 +32,8 @@ from loguru import logger
 # System API base URL - set by the runtime
 SYSTEM_SERVICE_URL = os.getenv("SYSTEM_SERVICE_URL", "http://system:8000")
 NATS_URL = os.getenv("NATS_URL", "nats://nats:4222")
+# Prepended to every subject, matching the system's handlers when they run namespaced (e.g. per test worker)
+NATS_SUBJECT_PREFIX = os.getenv("NATS_SUBJECT_PREFIX", "")
 
 
 class CognitionService:
@@ -60,7 +62,7 @@ class EconomicService:
         nc = await nats.connect(self.nats_url, connect_timeout=2)
         try:
             payload = json.dumps(data).encode() if data else b""
-            response = await nc.request(subject, payload, timeout=2)
+            response = await nc.request(f"{NATS_SUBJECT_PREFIX}{subject}", payload, timeout=2)
             return json.loads(response.data)
         finally:
             await nc.close()
@@ -141,7 +143,7 @@ class SocialService:
         nc = await nats.connect(self.nats_url, connect_timeout=2)
         try:
             payload = json.dumps(data).encode() if data else b""
-            response = await nc.request(subject, payload, timeout=2)
+            response = await nc.request(f"{NATS_SUBJECT_PREFIX}{subject}", payload, timeout=2)
             return json.loads(response.data)
         finally:
             await nc.close()
@@ -214,7 +216,7 @@ class SocialService:
     async def _publish(self, subject: str, data: dict):
         nc = await nats.connect(self.nats_url, connect_timeout=2)
         try:
-            await nc.publish(subject, json.dumps(data).encode())
+            await nc.publish(f"{NATS_SUBJECT_PREFIX}{subject}", json.dumps(data).encode())
         finally:
             await nc.close()
 
@@ -251,7 +253,7 @@ class EvolutionService:
         nc = await nats.connect(self.nats_url, connect_timeout=2)
         try:
             payload = json.dumps(data).encode() if data else b""
-            response = await nc.request(subject, payload, timeout=2)
+            response = await nc.request(f"{NATS_SUBJECT_PREFIX}{subject}", payload, timeout=2)
             return json.loads(response.data)
         finally:
             await nc.close()